@@ -0,0 +1,51 @@
+# benchmarks/bench_claim_batch.py
+#
+# Per-claim cost of checking many claims against one story: a loop over
+# compare_claim_across_articles (as the dashboard does today) versus compare_claims_batch.
+# Run from the repo root:  python -m benchmarks.bench_claim_batch [num_claims]
+
+import io
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+from benchmarks.bench_sentence_index import build_articles, build_vocabulary
+from modules import module4_claim_comparator
+from modules.module4_claim_comparator import compare_claim_across_articles, compare_claims_batch
+
+
+def build_claims(n, vocabulary, seed=13):
+    rng = random.Random(seed)
+    common = vocabulary[:300]
+    return [", ".join(" ".join(rng.choice(common) for _ in range(rng.randint(2, 4)))
+                      for _ in range(rng.randint(1, 3))) for _ in range(n)]
+
+
+def timed(func):
+    # every run starts cold: raw scores cached by an earlier row (the loop keeps them down to a
+    # floor of 60) would otherwise answer the later thresholds for free
+    module4_claim_comparator._score_cache.clear()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        func()
+    return time.perf_counter() - start
+
+
+def main():
+    num_claims = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    vocabulary = build_vocabulary()
+    articles = build_articles(300, vocabulary)
+    claims = build_claims(num_claims, vocabulary)
+    compare_claims_batch(claims[:1], articles, verbose=False)  # build the sentence index once
+
+    print(f"{num_claims} claims against {len(articles)} articles\n")
+    print(f"{'mode':>6} {'threshold':>10} {'loop (ms/claim)':>16} {'batch (ms/claim)':>17}")
+    for mode, threshold in (("fuzzy", 60), ("fuzzy", 90), ("tfidf", 30)):
+        loop = timed(lambda: [compare_claim_across_articles(c, articles, threshold, mode=mode) for c in claims])
+        batch = timed(lambda: compare_claims_batch(claims, articles, threshold, mode=mode))
+        print(f"{mode:>6} {threshold:>10} {loop / num_claims * 1000:>16.1f} {batch / num_claims * 1000:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
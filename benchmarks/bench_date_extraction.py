@@ -0,0 +1,96 @@
+# benchmarks/bench_date_extraction.py
+#
+# Micro-benchmark for publish-date inference over a synthetic fixture corpus.
+# Run from the repo root:  python -m benchmarks.bench_date_extraction [num_articles]
+
+import random
+import re
+import sys
+import time
+
+from dateutil.parser import parse
+
+from modules.module1d_date_extraction import infer_publish_date, extract_dates, clear_memo
+
+MONTH_NAMES = ["January", "Feb", "March", "Apr", "May", "June", "Jul", "August", "Sep", "October", "Nov", "December"]
+FILLER = ("Officials said the investigation is ongoing and more details would be released later. "
+          "Witnesses described a chaotic scene as emergency crews arrived. ")
+
+
+def build_corpus(n, seed=42):
+    """Deterministic mix of header styles: absolute, ISO, relative, URL-only and undated articles."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n):
+        y, m, d = rng.randint(2015, 2025), rng.randint(1, 12), rng.randint(1, 28)
+        style = i % 5
+        if style == 0:
+            header = f"By Staff Reporter | {MONTH_NAMES[m - 1]} {d}, {y} | "
+        elif style == 1:
+            header = f"Published {d} {MONTH_NAMES[m - 1]} {y}. "
+        elif style == 2:
+            header = f"Updated {y}-{m:02d}-{d:02d} 10:31 GMT. "
+        elif style == 3:
+            header = f"{rng.randint(1, 12)} hours ago — "
+        else:
+            header = ""
+        url = f"https://example{i % 40}.com/news/{y}/{m:02d}/{d:02d}/story-{i}" if i % 3 else f"https://example.com/story-{i}"
+        corpus.append({"url": url, "publish_date": None, "text": header + FILLER * 6})
+    return corpus
+
+
+def legacy_infer(article):
+    """The pre-engine code path: rebuild regexes and call dateutil per match."""
+    header_chunk = article["text"][:500]
+    patterns = [
+        r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+        r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2},?\s+\d{4}",
+        r"\b\d{1,2}\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+        r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{4}",
+        r"\b\d{4}-\d{2}-\d{2}"
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, header_chunk)
+        if match:
+            try:
+                return str(parse(match.group()).date())
+            except Exception:
+                continue
+    match = re.search(r"(\d{4})[/-](\d{2})[/-](\d{2})", article["url"])
+    if match:
+        try:
+            return str(parse("-".join(match.groups())).date())
+        except Exception:
+            return None
+    return None
+
+
+def timed(label, func, n):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1000:9.2f} ms  ({elapsed / n * 1e6:7.2f} µs/article)")
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    corpus = build_corpus(n)
+    print(f"Date inference over {n} fixture articles\n")
+
+    timed("legacy (re + dateutil)", lambda: [legacy_infer(a) for a in corpus], n)
+    clear_memo()
+    timed("infer_publish_date (cold)", lambda: [infer_publish_date(a) for a in corpus], n)
+    timed("infer_publish_date (memoized)", lambda: [infer_publish_date(a) for a in corpus], n)
+    clear_memo()
+    timed("extract_dates (batch, cold)", lambda: extract_dates(corpus), n)
+    timed("extract_dates (batch, memoized)", lambda: extract_dates(corpus), n)
+
+    absolute = [a for i, a in enumerate(corpus) if i % 5 != 3]
+    clear_memo()
+    mismatches = sum(legacy_infer(a) != d for a, d in zip(absolute, extract_dates(absolute)))
+    print(f"\nDisagreements with legacy on non-relative headers: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_domain_index.py
+#
+# Shows that URL filtering cost stays flat as the allowlist grows, versus the old
+# substring scan over news_domains.
+# Run from the repo root:  python -m benchmarks.bench_domain_index [num_urls]
+
+import random
+import sys
+import time
+
+from modules.module2_search_fallback import get_domain, news_domains
+from modules.module2c_domain_index import DomainIndex
+
+TLDS = ["com", "org", "net", "co.uk", "com.au", "ca", "de", "fr", "co.jp", "news"]
+
+
+def build_domains(n, seed=7):
+    rng = random.Random(seed)
+    domains = set(news_domains)
+    while len(domains) < n:
+        name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 12)))
+        domains.add(f"{name}.{rng.choice(TLDS)}")
+    return sorted(domains)
+
+
+def build_urls(domains, n, seed=11):
+    rng = random.Random(seed)
+    urls = []
+    for i in range(n):
+        if i % 2:
+            host = rng.choice(domains)
+        else:
+            host = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8)) + ".com"
+        prefix = rng.choice(["www.", "", "edition.", "live.news."])
+        urls.append(f"https://{prefix}{host}/2024/05/01/story-{i}")
+    return urls
+
+
+def legacy_filter(urls, domains):
+    return [u for u in urls if any(known in get_domain(u) for known in domains)]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    num_urls = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"Filtering {num_urls} URLs\n")
+    print(f"{'list size':>10} {'build (ms)':>11} {'index (µs/url)':>15} {'legacy (µs/url)':>16}")
+
+    for size in (41, 1_000, 10_000, 50_000):
+        domains = build_domains(size)
+        urls = build_urls(domains, num_urls)
+
+        build_time, index = timed(lambda: DomainIndex.from_domains(domains))
+        index_time, _ = timed(lambda: [u for u in urls if index.is_allowed(u)])
+
+        # the substring scan is linear in the list size; sample it on large lists
+        sample = urls if size <= 1_000 else urls[:200]
+        legacy_time, _ = timed(lambda: legacy_filter(sample, domains))
+
+        print(f"{size:>10} {build_time * 1000:>11.1f} {index_time / len(urls) * 1e6:>15.2f} "
+              f"{legacy_time / len(sample) * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
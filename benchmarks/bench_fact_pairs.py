@@ -0,0 +1,94 @@
+# benchmarks/bench_fact_pairs.py
+#
+# The visual diff tool on two long articles: the old all-pairs fact comparison plus one
+# re.sub per fact, versus the keyword-bucketed FactIndex and the single-pass highlighter.
+# Run from the repo root:  python -m benchmarks.bench_fact_pairs [words_per_article]
+
+import random
+import re
+import sys
+import time
+
+from modules.module1e_text_analysis import analyze_text
+from modules.module10_fact_pairs import extract_facts, highlight_facts, match_facts
+
+KEYWORDS = ["people", "injured", "killed", "percent", "million", "votes", "homes", "troops", "days", "miles"]
+
+
+def build_text(words, seed):
+    rng = random.Random(seed)
+    filler = [f"w{i}" for i in range(2000)]
+    sentences = []
+    count = 0
+    while count < words:
+        sentence = [rng.choice(filler) for _ in range(rng.randint(8, 20))]
+        for _ in range(rng.randint(0, 2)):
+            sentence.insert(rng.randrange(len(sentence)), f"{rng.randint(1, 500)} {rng.choice(KEYWORDS)}")
+        sentences.append(" ".join(sentence).capitalize())
+        count += len(sentence)
+    return ". ".join(sentences) + "."
+
+
+def old_diff(text_a, text_b, facts_a, facts_b, max_delta):
+    """The previous implementation, on (sentence, number, keyword) tuples."""
+    facts_a = [(f.sentence, f.number, f.keyword) for f in facts_a]
+    facts_b = [(f.sentence, f.number, f.keyword) for f in facts_b]
+
+    def number_to_int(n):
+        try:
+            return int(n.replace("%", ""))
+        except ValueError:
+            return None
+
+    matched_a, matched_b = set(), set()
+    unmatched_a, unmatched_b = set(facts_a), set(facts_b)
+    for (sent_a, num_a, kw_a) in facts_a:
+        n_a = number_to_int(num_a)
+        if n_a is not None:
+            for (sent_b, num_b, kw_b) in facts_b:
+                n_b = number_to_int(num_b)
+                if n_b is not None and kw_a == kw_b and abs(n_a - n_b) <= max_delta:
+                    matched_a.add((sent_a, num_a, kw_a))
+                    matched_b.add((sent_b, num_b, kw_b))
+                    unmatched_a.discard((sent_a, num_a, kw_a))
+                    unmatched_b.discard((sent_b, num_b, kw_b))
+
+    def highlight(text, matches, unmatched):
+        for css, facts in (("matched", matches), ("unmatched", unmatched)):
+            for (_, num, keyword) in facts:
+                pattern = re.escape(num) + r'.{0,30}' + re.escape(keyword)
+                text = re.sub(pattern, lambda m: f"<span class='{css}'>{m.group(0)}</span>", text, flags=re.IGNORECASE)
+        return text
+
+    return highlight(text_a, matched_a, unmatched_a), highlight(text_b, matched_b, unmatched_b)
+
+
+def new_diff(text_a, text_b, analysis_a, analysis_b, max_delta):
+    facts_a, facts_b = extract_facts(text_a, analysis_a), extract_facts(text_b, analysis_b)
+    matched_a, matched_b = match_facts(facts_a, facts_b, max_delta)
+    return (highlight_facts(text_a, analysis_a, facts_a, matched_a),
+            highlight_facts(text_b, analysis_b, facts_b, matched_b))
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    text_a, text_b = build_text(words, 1), build_text(words, 2)
+    analysis_a, analysis_b = analyze_text(text_a), analyze_text(text_b)
+    facts_a, facts_b = extract_facts(text_a, analysis_a), extract_facts(text_b, analysis_b)
+    print(f"{words} words per article, {len(facts_a)} + {len(facts_b)} facts\n")
+
+    print(f"{'max_delta':>10} {'old (ms)':>10} {'new (ms)':>10}")
+    for max_delta in (1, 5, 20):
+        old = timed(lambda: old_diff(text_a, text_b, facts_a, facts_b, max_delta))
+        new = timed(lambda: new_diff(text_a, text_b, analysis_a, analysis_b, max_delta))
+        print(f"{max_delta:>10} {old * 1000:>10.1f} {new * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
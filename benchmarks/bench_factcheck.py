@@ -0,0 +1,92 @@
+# benchmarks/bench_factcheck.py
+#
+# Fact-check step against stand-in providers served locally with different delays, first all
+# healthy and then with one hanging past its timeout: the old sequential calls versus the
+# concurrent aggregator, cold and then repeated from its cache.
+# Run from the repo root:  python -m benchmarks.bench_factcheck
+# Set ECHOLENS_CACHE_DIR to keep the benchmark's cache out of .echolens_cache/.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from modules.module5c_factcheck_aggregator import PROVIDERS, check_claim
+
+# provider → seconds the stand-in takes to answer
+DELAYS = {"fast": 0.2, "medium": 0.5, "slow": 1.0, "hanging": 5.0}
+TIMEOUT = (1, 1.5)
+
+
+class DelayedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(DELAYS[self.path.strip("/").split("?")[0]])
+        body = json.dumps([{"title": self.path, "url": self.path}]).encode("utf-8")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # the client gave up
+
+    def log_message(self, *args):
+        pass
+
+
+def provider(base, name):
+    def search(claim, session=None, timeout=None):
+        response = (session or requests).get(f"{base}/{name}", params={"q": claim}, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    return search
+
+
+def sequential(searches, claim):
+    results, errors = {}, {}
+    for name, search in searches.items():
+        try:
+            results[name] = search(claim, timeout=TIMEOUT)
+        except requests.RequestException as e:
+            errors[name] = type(e).__name__
+    return results, errors
+
+
+def timed(func):
+    start = time.perf_counter()
+    out = func()
+    return time.perf_counter() - start, out
+
+
+def run(base, names):
+    searches = {name: provider(base, name) for name in names}
+    PROVIDERS.clear()
+    PROVIDERS.update({name: (search, TIMEOUT) for name, search in searches.items()})
+    claim = f"benchmark claim {time.time()}"
+
+    print(f"providers: {', '.join(f'{n} ({DELAYS[n]}s)' for n in names)}; timeout {TIMEOUT}")
+    print(f"{'run':<24} {'seconds':>8}  errors")
+    seconds, (_, errors) = timed(lambda: sequential(searches, claim))
+    print(f"{'sequential':<24} {seconds:>8.2f}  {', '.join(errors) or '-'}")
+    for label in ("aggregator (cold)", "aggregator (repeat)"):
+        seconds, report = timed(lambda: check_claim(claim))
+        print(f"{label:<24} {seconds:>8.2f}  {', '.join(report['errors']) or '-'}"
+              f"  (cached: {', '.join(report['cached']) or '-'})")
+    print()
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DelayedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    run(base, ["fast", "medium", "slow"])
+    # failures are never cached, so the hanging provider is tried again on every repeat
+    run(base, ["fast", "medium", "slow", "hanging"])
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
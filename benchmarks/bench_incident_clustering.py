@@ -0,0 +1,91 @@
+# benchmarks/bench_incident_clustering.py
+#
+# Grouping a synthetic corpus (many incidents over several weeks, a week per 1000 articles) into incidents:
+# cluster_incidents (MinHash/LSH + date window) versus comparing every pair of articles
+# with difflib titles and set overlap, as run_incident_matching does for one original.
+# The pairwise baseline is timed on a sample of pairs and extrapolated to all n(n-1)/2.
+# Run from the repo root:  python -m benchmarks.bench_incident_clustering [max_articles]
+
+import datetime
+import random
+import sys
+import time
+
+from modules.module7_core_match import simple_similarity
+from modules.module7c_incident_clustering import cluster_incidents
+
+START = datetime.date(2024, 1, 1)
+
+
+def build_names(n, rng, syllables=("ka", "lo", "mi", "ren", "to", "va", "sh", "el", "un", "dar", "pe", "zi")):
+    return ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title() for _ in range(n)]
+
+
+def build_corpus(n, articles_per_incident=8, seed=7):
+    """n articles about n / articles_per_incident incidents spread over one week per 1000 articles."""
+    rng = random.Random(seed)
+    words = [w.lower() for w in build_names(3000, rng)]
+    places = build_names(300, rng)
+    days = max(14, n // 1000 * 7)
+    num_incidents = max(1, n // articles_per_incident)
+    incidents = []
+    for k in range(num_incidents):
+        entities = rng.sample(places, 2) + [f"Person{k}", f"Org{rng.randint(0, 999)}", f"Agency{rng.randint(0, 999)}"]
+        title = f"{' '.join(rng.sample(words, 4))} in {entities[0]} {' '.join(rng.sample(words, 3))}"
+        incidents.append((title, entities, START + datetime.timedelta(days=rng.randint(0, days))))
+
+    articles, entity_lists, truth = [], [], []
+    for i in range(n):
+        k = rng.randrange(num_incidents)
+        title, entities, day = incidents[k]
+        title_words = title.split()
+        title_words.insert(rng.randrange(len(title_words) + 1), rng.choice(words))
+        published = day + datetime.timedelta(days=rng.randint(0, 3))
+        articles.append({"url": f"https://example{i % 40}.com/{i}", "title": " ".join(title_words),
+                         "publish_date": published.isoformat(), "text": ""})
+        entity_lists.append(rng.sample(entities, 4) + [rng.choice(places)])
+        truth.append(k)
+    return articles, entity_lists, truth
+
+
+def pairwise_seconds(articles, entity_lists, samples=20000, seed=3):
+    """Estimated time to score every pair with difflib titles and entity-set overlap."""
+    rng = random.Random(seed)
+    n = len(articles)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(samples)]
+    start = time.perf_counter()
+    for i, j in pairs:
+        a, b = set(entity_lists[i]), set(entity_lists[j])
+        len(a & b) / max(len(a), 1)
+        simple_similarity(articles[i]["title"], articles[j]["title"])
+    per_pair = (time.perf_counter() - start) / samples
+    return per_pair * n * (n - 1) / 2
+
+
+def purity(clusters, truth):
+    """Share of articles whose cluster's majority incident is their own incident."""
+    correct = 0
+    for cluster in clusters:
+        labels = [truth[i] for i in cluster["members"]]
+        correct += max(labels.count(label) for label in set(labels))
+    return correct / len(truth)
+
+
+def main():
+    max_articles = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    sizes = [n for n in (1000, 2000, 4000, 8000, 16000) if n <= max_articles]
+
+    print(f"{'articles':>9} {'pairwise (s, est.)':>19} {'lsh (s)':>8} {'scored pairs':>13} "
+          f"{'clusters':>9} {'incidents':>10} {'purity':>7}")
+    for n in sizes:
+        articles, entity_lists, truth = build_corpus(n)
+        pairwise = pairwise_seconds(articles, entity_lists)
+        start = time.perf_counter()
+        clusters, links = cluster_incidents(articles, entity_lists=entity_lists)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>9} {pairwise:>19.1f} {elapsed:>8.2f} {len(links):>13} "
+              f"{len(clusters):>9} {len(set(truth)):>10} {purity(clusters, truth):>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
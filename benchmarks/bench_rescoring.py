@@ -0,0 +1,54 @@
+# benchmarks/bench_rescoring.py
+#
+# Re-running one claim over the same corpus while only the threshold changes, as the
+# dashboard does when the Match Threshold slider moves. The first run scores every
+# candidate sentence down to the score floor (so it can be slower than one uncached run at a
+# high threshold); later runs at any threshold re-select matches from the cached raw scores.
+# Run from the repo root:  python -m benchmarks.bench_rescoring [num_articles]
+
+import sys
+import time
+
+from benchmarks.bench_claim_batch import build_claims
+from benchmarks.bench_sentence_index import build_articles, build_vocabulary
+from modules.module4_claim_comparator import score_claim, score_corpus, score_tfidf
+from modules.module4b_sentence_index import get_sentence_index
+from modules.module4d_tfidf_index import get_tfidf_index
+
+
+def timed(func, repeat=3):
+    """Best of `repeat` runs, so garbage-collector pauses do not show up as cache misses."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    num_articles = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    vocabulary = build_vocabulary()
+    articles = build_articles(num_articles, vocabulary)
+    index = get_sentence_index(articles)
+    claim = build_claims(1, vocabulary)[0].split(", ")
+    get_tfidf_index(index)  # the TF-IDF matrix is built once per corpus either way
+
+    print(f"{len(index)} sentences in {num_articles} articles, claim {claim}\n")
+    for mode, thresholds in (("fuzzy", (90, 60, 75, 85)), ("tfidf", (30, 10, 50, 20))):
+        first = timed(lambda: score_claim(claim, articles, thresholds[0], verbose=False, index=index, mode=mode),
+                      repeat=1)
+        print(f"{mode}: first run at threshold {thresholds[0]} fills the cache in {first * 1000:.1f} ms")
+        print(f"{'threshold':>10} {'uncached (ms)':>14} {'cached (ms)':>12}")
+        for threshold in thresholds:
+            if mode == "fuzzy":
+                uncached = timed(lambda: score_corpus(claim, articles, threshold, verbose=False, index=index))
+            else:
+                uncached = timed(lambda: score_tfidf(claim, articles, threshold, verbose=False, index=index))
+            cached = timed(lambda: score_claim(claim, articles, threshold, verbose=False, index=index, mode=mode))
+            print(f"{threshold:>10} {uncached * 1000:>14.1f} {cached * 1000:>12.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
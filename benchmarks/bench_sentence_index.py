@@ -0,0 +1,77 @@
+# benchmarks/bench_sentence_index.py
+#
+# Claim scoring time with the sentence n-gram index versus scoring every sentence,
+# as the archive grows. Threshold 60 is too loose for the index to prune, so the
+# interesting rows are the higher thresholds and exact matching.
+# Run from the repo root:  python -m benchmarks.bench_sentence_index
+
+import io
+import random
+import time
+from contextlib import redirect_stdout
+
+from modules.module4_claim_comparator import score_corpus, score_sentences
+from modules.module4b_sentence_index import SentenceIndex
+
+CLAIM = ["ceasefire talks collapsed", "billion in aid"]
+
+
+def build_vocabulary(n=8000, seed=5):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 11))))
+    return sorted(words)
+
+
+def build_articles(n, vocabulary, seed=9):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]  # Zipf-like word frequencies
+    articles = []
+    for i in range(n):
+        sentences = []
+        for _ in range(rng.randint(10, 40)):
+            words = rng.choices(vocabulary, weights, k=rng.randint(6, 30))
+            if rng.random() < 0.01:
+                words.insert(rng.randrange(len(words)), rng.choice(CLAIM))
+            sentences.append(" ".join(words))
+        articles.append({"url": f"https://example.com/{i}", "title": f"Story {i}", "text": ". ".join(sentences)})
+    return articles
+
+
+def timed(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    vocabulary = build_vocabulary()
+    score_sentences(CLAIM, ["warm up"])
+
+    print(f"{'articles':>9} {'sentences':>10} {'build (s)':>10} {'mode':>10} "
+          f"{'candidates':>11} {'indexed (ms)':>13} {'full (ms)':>10}")
+    for size in (100, 1_000, 3_000):
+        articles = build_articles(size, vocabulary)
+        start = time.perf_counter()
+        index = SentenceIndex(articles)
+        build_time = time.perf_counter() - start
+        # without q-grams the index never prunes, i.e. the pre-index behaviour
+        full = SentenceIndex(articles, qgrams=())
+
+        for label, threshold, exact in (("T=60", 60, False), ("T=85", 85, False),
+                                        ("T=90", 90, False), ("exact", 100, True)):
+            candidates = index.candidates_for_phrases([p.lower() for p in CLAIM], threshold, exact)
+            count = len(index) if candidates is None else len(candidates)
+            indexed = timed(lambda: score_corpus(CLAIM, articles, threshold, exact, False, index=index))
+            scanned = timed(lambda: score_corpus(CLAIM, articles, threshold, exact, False, index=full))
+            print(f"{size:>9} {len(index):>10} {build_time:>10.2f} {label:>10} "
+                  f"{count:>11} {indexed * 1000:>13.1f} {scanned * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_startup.py
+#
+# Start-up budget for the apps: the cold import time of each entry point's modules, each
+# measured in a fresh interpreter, then the one-off cost of loading each NLP resource through
+# the model registry and the cost of asking for it again (what every Streamlit rerun pays).
+# Run from the repo root:  python -m benchmarks.bench_startup [budget_seconds]
+
+import subprocess
+import sys
+import time
+
+from modules.module0_model_registry import get_resource, load_times
+
+ENTRY_POINTS = {
+    "echolens_streamlit_ui": [
+        "modules.module1e_text_analysis", "modules.module10_fact_pairs",
+        "modules.module10b_fact_consensus", "modules.module11_results_table",
+        "modules.module12_job_queue", "modules.module12b_analysis_jobs",
+    ],
+    "echolens_dashboard": [
+        "modules.module4_claim_comparator", "modules.module5c_factcheck_aggregator",
+        "modules.module7_core_match", "modules.module9_article_store",
+    ],
+    "main_echolens": [
+        "modules.module1_article_ingestion", "modules.module2_search_fallback",
+        "modules.module5c_factcheck_aggregator", "modules.module6b_html_report",
+        "modules.module8_streaming_pipeline", "modules.module9_article_store",
+    ],
+}
+HEAVY = ("spacy", "nltk", "sklearn", "pandas", "newspaper")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+print(time.perf_counter() - start, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def cold_import(modules):
+    """Seconds to import `modules` in a fresh interpreter, and which heavy libraries came with them."""
+    out = subprocess.run([sys.executable, "-c", PROBE.format(heavy=HEAVY), *modules],
+                         capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), out[1] if len(out) > 1 else "-"
+
+
+def warm_call(func, repeat=1000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+
+    print(f"{'entry point':<24} {'cold import (s)':>16} {'budget':>7}  heavy libraries loaded")
+    for entry, modules in ENTRY_POINTS.items():
+        seconds, heavy = cold_import(modules)
+        status = "ok" if seconds <= budget else "OVER"
+        print(f"{entry:<24} {seconds:>16.2f} {status:>7}  {heavy}")
+
+    from modules.module1e_text_analysis import get_ner, stem
+    from modules.module4b_sentence_index import SentenceIndex
+    from modules.module4d_tfidf_index import TfidfSentenceIndex
+
+    articles = [{"url": "u", "title": "t", "text": "Officials said the talks would resume. Markets rallied."}]
+    stem.cache_clear()
+    stem("talks")
+    get_ner()
+    TfidfSentenceIndex(SentenceIndex(articles, qgrams=()))
+
+    print(f"\n{'resource':<48} {'first load (s)':>15} {'warm call (us)':>15}")
+    for key, seconds in load_times().items():
+        name = key if isinstance(key, str) else " ".join(str(part) for part in key)
+        per_call = warm_call(lambda: get_resource(key, None))
+        print(f"{name[:48]:<48} {seconds:>15.2f} {per_call * 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
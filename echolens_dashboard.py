@@ -1,20 +1,19 @@
-import json
 import streamlit as st
 from modules.module4_claim_comparator import compare_claim_across_articles
-from modules.module5_factcheck import fact_check_claim
-from modules.module5b_factcheck_scraper import search_politifact, search_snopes
+from modules.module5c_factcheck_aggregator import check_claim
 from modules.module7_core_match import run_incident_matching
+from modules.module9_article_store import get_article_store
 
 st.set_page_config(layout="wide", page_title="EchoLens Dashboard")
 st.title("EchoLens: News Claim Comparator & Fact Checker")
 
-# Load original article
-try:
-    with open("original_article.json", "r", encoding="utf-8") as f:
-        original = json.load(f)
-except FileNotFoundError:
-    st.error("No original_article.json found. Please run the main workflow first.")
+# Load original article (metadata only; the body is read on first access)
+store = get_article_store()
+original = store.load_one("original")
+if original is None:
+    st.error("No saved original article found. Please run the main workflow first.")
     st.stop()
+related_articles = store.load("related", store.latest_session("original"))
 
 st.sidebar.header("Step 1: Enter a Claim")
 claim = st.sidebar.text_input("Example: '3 suspects involved'", "")
@@ -36,14 +35,14 @@ with st.expander("Original Article"):
 # Run comparison and incident verification
 if run_comparison:
     st.header("Claim Match Results")
-    match_results = compare_claim_across_articles(claim)
-    core_results = run_incident_matching()
+    match_results = compare_claim_across_articles(claim, related_articles)
+    core_results = run_incident_matching(match_results, original.to_dict())
     verdict_map = {v["url"]: v for v in core_results}
 
     verdict_filter = st.sidebar.radio("Filter by Match", ("All", "Likely Same Incident", "Possibly Related", "Unlikely Related"))
 
     for result in match_results:
-        url = result["source"]
+        url = result["url"]
         verdict = verdict_map.get(url, {}).get("verdict", "Unknown")
         if verdict_filter != "All" and verdict != verdict_filter:
             continue
@@ -52,14 +51,23 @@ if run_comparison:
         st.subheader(result["title"])
         st.markdown(f"**Verdict:** <span style='color:{color}'>{verdict}</span>", unsafe_allow_html=True)
         st.caption(url)
+        if result.get("mirrors"):
+            st.caption("Also published by: " + ", ".join(m["domain"] for m in result["mirrors"]))
         for match in result["matches"]:
             st.markdown(f"- **[{match['score']}%]** {match['sentence']}")
         if not result["matches"]:
             st.markdown("*No relevant matches found.*")
 
+# Every selected provider is queried concurrently; a claim checked recently is served from cache
+providers = (["google"] if run_factcheck else []) + (["politifact", "snopes"] if run_fallbacks else [])
+checks = check_claim(claim, providers) if providers else None
+if checks:
+    for source, error in checks["errors"].items():
+        st.warning(f"⚠️ {source} fact check unavailable: {error}")
+
 if run_factcheck:
     st.header("Google Fact Check")
-    g_results = fact_check_claim(claim)
+    g_results = checks["results"]["google"]
     for res in g_results:
         st.markdown(f"**{res['text']}**")
         for r in res.get("claimReview", []):
@@ -69,9 +77,9 @@ if run_fallbacks:
     st.header("Fallback Fact Checks")
 
     with st.expander("PolitiFact"):
-        for r in search_politifact(claim):
+        for r in checks["results"]["politifact"]:
             st.markdown(f"**{r['title']}** – {r['rating']} – [Link]({r['url']})")
 
     with st.expander("Snopes"):
-        for r in search_snopes(claim):
+        for r in checks["results"]["snopes"]:
             st.markdown(f"**{r['title']}** – [Link]({r['url']})")
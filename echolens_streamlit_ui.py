@@ -1,49 +1,29 @@
 # echolens_streamlit_ui.py
 
+import time
+
 import streamlit as st
-import json
-import os
-import io
-from datetime import datetime
-from collections import defaultdict
-import spacy
-import nltk
-nltk.download('punkt')
-from nltk.stem import PorterStemmer
-from nltk.tokenize import word_tokenize
-import difflib
-from difflib import SequenceMatcher
-import re
-import pandas as pd
-from urllib.parse import quote_plus
-
-from modules.module1_article_ingestion import NewsArticle
-from modules.module2_search_fallback import search_related_articles
-from modules.module3_extract_related import extract_related_articles
-from modules.module4_claim_comparator import compare_claim_across_articles
-from modules.module5_factcheck import fact_check_claim
-from modules.module5b_factcheck_scraper import search_politifact, search_snopes
-from modules.module7_core_match import run_incident_matching
-
-# Load Spacy model safely
-def load_spacy_model():
-    try:
-        return spacy.load("en_core_web_sm")
-    except OSError:
-        from spacy.cli import download
-        download("en_core_web_sm")
-        return spacy.load("en_core_web_sm")
-
-nlp = load_spacy_model()
+
+from modules.module0_model_registry import allow_downloads
+from modules.module1e_text_analysis import analyze_text, get_analysis
+from modules.module10_fact_pairs import extract_facts, highlight_facts, match_facts
+from modules.module10b_fact_consensus import NumericFactIndex
+from modules.module11_results_table import PAGE_SIZE, ResultsTable
+from modules.module12_job_queue import PENDING, get_job_queue
+from modules.module12b_analysis_jobs import submit_analysis, submit_extraction
+
+POLL_INTERVAL = 1.0
+
+# Models load lazily, once per process, the first time a step needs them (installing
+# en_core_web_sm if it is missing) instead of on every Streamlit rerun
+allow_downloads()
 
 # Streamlit setup
 st.set_page_config(page_title="EchoLens", layout="wide")
 st.title("🧠 EchoLens News Comparison Dashboard")
 
-ps = PorterStemmer()
-
 # Initialize session state
-for key in ["original_article", "related_articles", "match_results", "core_results", "fact_checks"]:
+for key in ["original_article", "related_articles", "match_results", "core_results", "fact_checks", "store_session", "fact_index", "results_table", "extraction_job", "analysis_job"]:
     if key not in st.session_state:
         st.session_state[key] = None
 
@@ -53,39 +33,71 @@ article_url = st.text_input("Paste the URL of the article you want to analyze:")
 run_extraction = st.button("Extract and Analyze")
 
 if run_extraction and article_url:
-    with st.spinner("Extracting original article..."):
-        article = NewsArticle(article_url).extract()
-        st.session_state.original_article = article.to_dict()
-
-    with st.spinner("Searching for related articles..."):
-        related_urls = search_related_articles(article.title)
-        if len(related_urls) < 5:
-            relaxed_query = " ".join(article.title.split()[:6])
-            relaxed_urls = search_related_articles(relaxed_query)
-            related_urls = list(set(related_urls + relaxed_urls))
-        st.session_state.related_articles = extract_related_articles(related_urls)
-
-    st.success(f"✅ Found and extracted {len(related_urls)} related articles.")
+    # Runs in the shared worker pool; another analyst extracting the same URL joins this job
+    st.session_state.extraction_job = submit_extraction(article_url)
+
+if st.session_state.extraction_job:
+    job = get_job_queue().status(st.session_state.extraction_job)
+    if job is not None and job["status"] in PENDING:
+        st.progress(job["progress"], text=job["message"] or "Waiting for a free worker...")
+        # what the job has produced so far, redrawn on every poll
+        st.markdown("\n".join(f"- {item}" for item in job["partial"]))
+    else:
+        st.session_state.extraction_job = None
+        corpus = get_job_queue().result(job["id"]) if job and job["status"] == "done" else None
+        if job is not None and job["status"] == "failed":
+            st.error(f"❌ Extraction failed: {job['error']}")
+        elif corpus is None:
+            st.warning("⚠️ Extraction results are no longer available, please run it again.")
+        else:
+            st.session_state.original_article = corpus["original"]
+            st.session_state.related_articles = corpus["related"]
+            st.session_state.store_session = corpus["session"]
+            extracted, related, failed = corpus["extracted"], corpus["related"], corpus["failed"]
+            st.success(f"✅ Found and extracted {extracted} related articles."
+                       + (f" ({extracted - len(related)} syndicated copies merged)" if extracted > len(related) else "")
+                       + (f" ({failed} could not be fetched)" if failed else ""))
 
 # --- Step 2: Claim Matching ---
 st.header("🧩 Step 2: Enter Claim or Keywords")
 claim_input = st.text_input("Enter key phrases (e.g., 'Trump AND Ukraine OR Musk'):", "Trump AND Ukraine OR Musk")
 exact_match = st.toggle("Require Exact Match", value=False)
-threshold = st.slider("Match Threshold", 50, 100, 60)
+match_mode = st.selectbox("Matching Mode", ["Fuzzy (same wording)", "TF-IDF (paraphrases)"])
+mode = "tfidf" if match_mode.startswith("TF-IDF") else "fuzzy"
+if mode == "tfidf":
+    threshold = st.slider("Match Threshold (cosine similarity %)", 5, 100, 30)
+else:
+    threshold = st.slider("Match Threshold", 50, 100, 60)
 run_match = st.button("Run Analysis")
 
-if run_match and claim_input:
-    with st.spinner("Running claim comparison and incident matching..."):
-        st.session_state.match_results = compare_claim_across_articles(
-            claim_input,
-            st.session_state.related_articles,  # <<<<<<<<<< fixed
-            threshold=threshold if not exact_match else 100
-        )
-        st.session_state.core_results = run_incident_matching(
-            st.session_state.match_results,
-            st.session_state.original_article
-        )
-    st.success("✅ Matching complete.")
+if run_match and claim_input and st.session_state.related_articles is not None:
+    corpus = {"original": st.session_state.original_article, "related": st.session_state.related_articles,
+              "session": st.session_state.store_session}
+    st.session_state.analysis_job = submit_analysis(
+        corpus,
+        claim_input,
+        threshold=threshold if not exact_match else 100,
+        mode=mode)
+
+if st.session_state.analysis_job:
+    job = get_job_queue().status(st.session_state.analysis_job)
+    if job is not None and job["status"] in PENDING:
+        st.progress(job["progress"], text=job["message"] or "Waiting for a free worker...")
+        # what the job has produced so far, redrawn on every poll
+        st.markdown("\n".join(f"- {item}" for item in job["partial"]))
+    else:
+        st.session_state.analysis_job = None
+        analysis = get_job_queue().result(job["id"]) if job and job["status"] == "done" else None
+        if job is not None and job["status"] == "failed":
+            st.error(f"❌ Analysis failed: {job['error']}")
+        elif analysis is None:
+            st.warning("⚠️ Analysis results are no longer available, please run it again.")
+        else:
+            st.session_state.match_results = analysis["match_results"]
+            st.session_state.core_results = analysis["core_results"]
+            st.session_state.fact_index = None
+            st.session_state.results_table = None
+            st.success("✅ Matching complete.")
 
 # --- Step 3: Explore Results ---
 if st.session_state.core_results:
@@ -96,38 +108,39 @@ if st.session_state.core_results:
     entity_range = st.sidebar.slider("Entity Score Range", 0, 100, (0, 100))
     title_range = st.sidebar.slider("Title Score Range", 0, 100, (0, 100))
     date_filter = st.sidebar.selectbox("Date Nearby", ["All", True, False])
-    score_filter = st.sidebar.slider("Min Sentence Match Score", 0, 100, 60)
-
-    phrases = sorted({m.get("phrase", "Unknown") for a in st.session_state.core_results for m in a.get("matches", [])})
-    phrase_filter = st.sidebar.multiselect("Trigger Keywords", phrases)
-
-    def filter_articles(data):
-        filtered = []
-        for article in data:
-            if verdict_filter != "All" and article['verdict'] != verdict_filter:
-                continue
-            if not (entity_range[0] <= article['entity_score'] <= entity_range[1]):
-                continue
-            if not (title_range[0] <= article['title_score'] <= title_range[1]):
-                continue
-            if date_filter != "All" and article['same_date_window'] != date_filter:
-                continue
-            matches = [m for m in article.get("matches", [])
-                       if m['score'] >= score_filter and (not phrase_filter or m.get('phrase') in phrase_filter)]
-            if matches or verdict_filter != "Unlikely Related":
-                a = article.copy()
-                a['matches'] = matches
-                filtered.append(a)
-        return filtered
-
-    for a in filter_articles(st.session_state.core_results):
+    score_filter = st.sidebar.slider("Min Sentence Match Score", 0, 100, threshold)
+
+    # Columnar copy of the results, built once per analysis run; filters below are vectorized masks
+    if st.session_state.results_table is None:
+        st.session_state.results_table = ResultsTable(st.session_state.core_results)
+    table = st.session_state.results_table
+
+    phrase_filter = st.sidebar.multiselect("Trigger Keywords", table.phrases)
+
+    articles, matches = table.filter(verdict_filter, entity_range, title_range, date_filter, score_filter, phrase_filter)
+
+    # the CSV is rebuilt only when a filter changes, not on every rerun
+    csv = table.filtered_csv(verdict_filter, entity_range, title_range, date_filter, score_filter, phrase_filter)
+    st.download_button("📄 Download Filtered Results (CSV)", csv,
+                       file_name="echolens_results.csv", mime="text/csv")
+
+    # Only one page of expanders is rendered per rerun
+    pages = max(1, -(-len(articles) // PAGE_SIZE))
+    page = st.number_input(f"Page (of {pages}, {len(articles)} articles)", min_value=1, max_value=pages, value=1)
+    page_articles = ResultsTable.page(articles, page)
+    page_matches = matches[matches["article"].isin(page_articles.index)]
+    matches_by_article = {i: group for i, group in page_matches.groupby("article", sort=False)}
+    for i, a in page_articles.iterrows():
         with st.expander(f"{a['title']} [{a['verdict']}]"):
             st.write(f"**URL**: [{a['url']}]({a['url']})")
-            st.write(f"**Entity Score**: {a['entity_score']}% | **Title Score**: {a['title_score']}%")
+            st.write(f"**Entity Score**: {a['entity_score']:g}% | **Title Score**: {a['title_score']:g}%")
             st.write(f"**Date Nearby**: {a['same_date_window']}")
-            if a.get("matches"):
-                for m in a['matches']:
-                    st.markdown(f"- [`{m.get('phrase', '?')}` | {m['score']}%] {m['sentence']}")
+            mirrors = st.session_state.core_results[i].get("mirrors")
+            if mirrors:
+                st.write("**Also published by**: " + ", ".join(f"[{m['domain']}]({m['url']})" for m in mirrors))
+            if i in matches_by_article:
+                for m in matches_by_article[i].itertuples():
+                    st.markdown(f"- [`{m.phrase}` | {m.score:g}%] {m.sentence}")
             else:
                 st.info("No sentence matches found.")
 # --- Fact Check Summary ---
@@ -140,6 +153,34 @@ if st.session_state.fact_checks:
         st.write(f"🌐 **Source:** [{claim.get('publisher', 'Unknown')}]( {claim.get('url', '#')})")
         st.markdown("---")
 
+# --- Numeric Consensus ---
+if st.session_state.core_results and len(st.session_state.core_results) >= 2:
+    st.header("📐 Numeric Consensus Across Outlets")
+
+    # Built once per analysis run; the sliders below only regroup the indexed facts
+    if st.session_state.fact_index is None:
+        st.session_state.fact_index = NumericFactIndex(st.session_state.core_results)
+    fact_index = st.session_state.fact_index
+
+    tolerance = st.slider("Allowed Difference Between Outlets (%)", min_value=0, max_value=50, value=10, step=1)
+    min_outlets = st.slider("Minimum Agreeing Outlets", min_value=2, max_value=max(2, len(set(fact_index.labels))), value=2)
+    disputed_only = st.toggle("Only Show Disputed Numbers", value=True)
+
+    entries = fact_index.consensus(tolerance=tolerance / 100, min_outlets=min_outlets)
+    if disputed_only:
+        entries = [e for e in entries if e["outliers"]]
+    if not entries:
+        st.info("No number is reported by enough outlets to compare.")
+    for e in entries:
+        value = f"{e['low']}–{e['high']}" if e["low"] != e["high"] else f"{e['low']}"
+        label = f"{value} {e['word']} · {len(e['outlets'])} of {e['reporting']} outlets agree"
+        if e["outliers"]:
+            label += f" · ⚠️ {len(e['outliers'])} outlier(s)"
+        with st.expander(label):
+            st.write("**Agreeing outlets**: " + ", ".join(e["outlets"]))
+            for o in e["outliers"]:
+                st.markdown(f"- ⚠️ [{o['outlet']}]({o['url']}) says **{o['value']}**: {o['sentence']}")
+
 # --- Visual Diff Tool ---
 if st.session_state.core_results and len(st.session_state.core_results) >= 2:
     st.header("📝 Visual Diff Between Two Articles (Strict Fact-Pair Matching)")
@@ -156,61 +197,20 @@ if st.session_state.core_results and len(st.session_state.core_results) >= 2:
             text = "\n".join(m["sentence"] for m in article.get("matches", []))
         return text
 
-    text_a = get_text(st.session_state.core_results[a_idx])
-    text_b = get_text(st.session_state.core_results[b_idx])
-
-    def normalize_tokens(text):
-        return re.findall(r"\w+|%+", text.lower())
-
-    def extract_sentences(text):
-        return re.split(r'(?<=[.!?]) +', text)
-
-    def extract_fact_pairs(text):
-        fact_pairs = []
-        for sentence in extract_sentences(text):
-            tokens = normalize_tokens(sentence)
-            for i in range(len(tokens)-1):
-                if re.match(r"\d+%?", tokens[i]):
-                    fact_pairs.append((sentence.strip(), tokens[i], ps.stem(tokens[i+1])))
-                elif re.match(r"\d+%?", tokens[i+1]):
-                    fact_pairs.append((sentence.strip(), tokens[i+1], ps.stem(tokens[i])))
-        return fact_pairs
-
-    def number_to_int(n):
-        n = n.replace("%", "")
-        try:
-            return int(n)
-        except:
-            return None
-
-    facts_a = extract_fact_pairs(text_a)
-    facts_b = extract_fact_pairs(text_b)
-
-    matched_a = set()
-    matched_b = set()
-    unmatched_a = set(facts_a)
-    unmatched_b = set(facts_b)
-
-    for (sent_a, num_a, kw_a) in facts_a:
-        n_a = number_to_int(num_a)
-        if n_a is not None:
-            for (sent_b, num_b, kw_b) in facts_b:
-                n_b = number_to_int(num_b)
-                if n_b is not None:
-                    if kw_a == kw_b and abs(n_a - n_b) <= max_delta:
-                        matched_a.add((sent_a, num_a, kw_a))
-                        matched_b.add((sent_b, num_b, kw_b))
-                        unmatched_a.discard((sent_a, num_a, kw_a))
-                        unmatched_b.discard((sent_b, num_b, kw_b))
-
-    def highlight_facts(text, matches, unmatched):
-        for (sentence, num, keyword) in matches:
-            pattern = re.escape(num) + r'.{0,30}' + re.escape(keyword)
-            text = re.sub(pattern, lambda m: f"<span class='matched'>{m.group(0)}</span>", text, flags=re.IGNORECASE)
-        for (sentence, num, keyword) in unmatched:
-            pattern = re.escape(num) + r'.{0,30}' + re.escape(keyword)
-            text = re.sub(pattern, lambda m: f"<span class='unmatched'>{m.group(0)}</span>", text, flags=re.IGNORECASE)
-        return text
+    article_a = st.session_state.core_results[a_idx]
+    article_b = st.session_state.core_results[b_idx]
+    text_a = get_text(article_a)
+    text_b = get_text(article_b)
+
+    def get_article_analysis(article, text):
+        # articles without a body fall back to their matched sentences, analyzed on the spot
+        return get_analysis(article) if article.get("text") else analyze_text(text)
+
+    analysis_a = get_article_analysis(article_a, text_a)
+    analysis_b = get_article_analysis(article_b, text_b)
+    facts_a = extract_facts(text_a, analysis_a)
+    facts_b = extract_facts(text_b, analysis_b)
+    matched_a, matched_b = match_facts(facts_a, facts_b, max_delta)
 
     st.markdown("""
     <style>
@@ -227,8 +227,8 @@ if st.session_state.core_results and len(st.session_state.core_results) >= 2:
     </style>
     """, unsafe_allow_html=True)
 
-    highlighted_a = highlight_facts(text_a, matched_a, unmatched_a)
-    highlighted_b = highlight_facts(text_b, matched_b, unmatched_b)
+    highlighted_a = highlight_facts(text_a, analysis_a, facts_a, matched_a)
+    highlighted_b = highlight_facts(text_b, analysis_b, facts_b, matched_b)
 
     st.markdown("### 📰 Original Article", unsafe_allow_html=True)
     st.markdown(f"<div style='border:1px solid #ccc; padding:10px; max-height:400px; overflow:auto;'>{highlighted_a}</div>", unsafe_allow_html=True)
@@ -248,4 +248,9 @@ st.markdown("""<hr style="margin-top: 50px;">
 <center><sub>© 2025 Sunshine Craft & Soap LLC • EchoLens v1.0</sub></center>
 """, unsafe_allow_html=True)
 
-st.markdown("[View License](./LICENSE.txt)")
\ No newline at end of file
+st.markdown("[View License](./LICENSE.txt)")
+
+# Poll running jobs: the page stays usable and is redrawn with fresh progress until they finish
+if st.session_state.extraction_job or st.session_state.analysis_job:
+    time.sleep(POLL_INTERVAL)
+    st.rerun()
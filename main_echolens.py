@@ -2,13 +2,10 @@
 
 from modules.module1_article_ingestion import NewsArticle
 from modules.module2_search_fallback import search_related_articles
-from modules.module3_extract_related import extract_related_articles
-from modules.module4_claim_comparator import compare_claim_across_articles
-from modules.module5_factcheck import fact_check_claim
-from modules.module5b_factcheck_scraper import search_politifact, search_snopes
+from modules.module5c_factcheck_aggregator import check_claim
 from modules.module6b_html_report import generate_html_report
-from modules.module7_core_match import run_incident_matching
-import json
+from modules.module8_streaming_pipeline import stream_pipeline
+from modules.module9_article_store import get_article_store
 
 def main():
     print("=== EchoLens v1.0 ===")
@@ -19,8 +16,8 @@ def main():
     article.preview()
 
     # Save original for comparison
-    with open("original_article.json", "w", encoding="utf-8") as f:
-        f.write(json.dumps(article.to_dict(), indent=4))
+    store = get_article_store()
+    session = store.save([article.to_dict()], "original")
 
     # Search for related URLs
     query = article.title
@@ -30,25 +27,25 @@ def main():
     for u in related_urls:
         print(f"- {u}")
 
-    # Extract related articles
-    extract_related_articles(related_urls)
-
     # Ask user for claim
     claim = input("\nEnter a specific claim or keywords (comma-separated): ").strip()
 
-    # Compare claim across articles
-    match_results = compare_claim_across_articles(claim)
-
-    # Run entity+date/title analysis
-    print("\n🔎 Running incident match verification...")
-    core_results = run_incident_matching(match_results=match_results)
+    # Extract, compare and verify each related article as soon as it is fetched
+    print("\n🔎 Extracting related articles and running incident match verification...")
+    match_results = []
+    core_results = []
+    for match_result, r in stream_pipeline(related_urls, claim, article.to_dict()):
+        match_results.append(match_result)
+        if r is None:
+            continue
+        core_results.append(r)
 
-    # Display summary
-    for r in core_results:
         print(f"\n📄 {r['title']}")
         print(f" - Verdict: {r['verdict']}")
         print(f" - Date Match: {r['same_date_window']} | Entity Score: {r['entity_score']}% | Title Score: {r['title_score']}%")
         print(f" - URL: {r['url']}")
+        for m in r.get("mirrors", []):
+            print(f" - Also published by {m['domain']}: {m['url']}")
 
         if r.get("matches"):
             print(" - Matching Sentences:")
@@ -57,18 +54,23 @@ def main():
         else:
             print("   • No matching sentences found.")
 
+    store.save(match_results, "related", session)
+
     # Optional: Fact check
     fact_check_result = None
     politifact_results = []
     snopes_results = []
 
     if input("\nWould you like to run automated fact checks? (y/n): ").lower() == "y":
-        fact_check_result = fact_check_claim(claim)
+        # Google, PolitiFact and Snopes are queried concurrently; repeats come from the cache
+        checks = check_claim(claim)
+        fact_check_result = checks["results"]["google"]
+        politifact_results = checks["results"]["politifact"]
+        snopes_results = checks["results"]["snopes"]
+        for source, error in checks["errors"].items():
+            print(f"⚠️ {source} fact check unavailable: {error}")
 
         print("\nManual fact-check sources:")
-        politifact_results = search_politifact(claim)
-        snopes_results = search_snopes(claim)
-
         for source, results in [("PolitiFact", politifact_results), ("Snopes", snopes_results)]:
             print(f"\n🔍 {source} Results:")
             for res in results:
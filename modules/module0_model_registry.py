@@ -0,0 +1,103 @@
+# modules/module0_model_registry.py
+
+import importlib
+import logging
+import os
+import threading
+import time
+from importlib import metadata
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Missing spaCy models are only fetched over the network when this is on
+ALLOW_DOWNLOADS = os.getenv("ECHOLENS_ALLOW_DOWNLOADS", "0") == "1"
+
+_resources = {}
+_load_seconds = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def allow_downloads(enabled=True):
+    """Let missing models be downloaded on first use (the Streamlit app turns this on)."""
+    global ALLOW_DOWNLOADS
+    ALLOW_DOWNLOADS = enabled
+
+
+def get_resource(key, loader):
+    """
+    Process-wide singleton: `loader()` runs once per key and every later call, from any thread
+    or Streamlit rerun, returns the same object without touching disk or network. Modules stay
+    imported across reruns, so this lives as long as st.cache_resource would.
+    """
+    resource = _resources.get(key)
+    if resource is not None:
+        return resource
+    with _registry_lock:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _resources:
+            start = time.perf_counter()
+            _resources[key] = loader()
+            _load_seconds[key] = time.perf_counter() - start
+            logging.info(f"Loaded {key} in {_load_seconds[key]:.2f}s")
+        return _resources[key]
+
+
+def peek_resource(key):
+    """The resource for `key` if it has already been loaded, else None; never runs a loader."""
+    return _resources.get(key)
+
+
+def load_times():
+    """{resource key: seconds its loader took}, for start-up reporting."""
+    return dict(_load_seconds)
+
+
+def lazy_import(name):
+    """Import a heavy module on first use; repeat calls are a dict lookup."""
+    return get_resource(("module", name), lambda: importlib.import_module(name))
+
+
+def package_version(name):
+    """Installed version of a package (e.g. a spaCy model) without importing it, or None."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _load_spacy(name, exclude):
+    spacy = lazy_import("spacy")
+    try:
+        return spacy.load(name, exclude=list(exclude))
+    except OSError:
+        if not ALLOW_DOWNLOADS:
+            raise
+    logging.info(f"Downloading spaCy model {name}")
+    try:
+        from spacy.cli import download
+        download(name)
+    except SystemExit as e:
+        # spacy.cli exits the interpreter when pip fails; surface it as the missing model instead
+        raise OSError(f"Could not download spaCy model {name}") from e
+    importlib.invalidate_caches()
+    return spacy.load(name, exclude=list(exclude))
+
+
+def spacy_model(name, exclude=()):
+    """A spaCy pipeline loaded once per (name, excluded components); raises OSError if not installed."""
+    return get_resource(("spacy", name, tuple(exclude)), lambda: _load_spacy(name, exclude))
+
+
+def blank_spacy(lang="en"):
+    return get_resource(("spacy-blank", lang), lambda: lazy_import("spacy").blank(lang))
+
+
+def porter_stemmer():
+    return get_resource("porter-stemmer", lambda: lazy_import("nltk.stem.porter").PorterStemmer())
@@ -0,0 +1,94 @@
+# modules/module10_fact_pairs.py
+
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+
+from modules.module1e_text_analysis import TOKEN_PATTERN, token_sentences
+
+# One number next to a word: `value` is None for tokens like "5th" that are not plain integers;
+# `start`/`end` are the offsets of the two tokens in the article text, for highlighting
+Fact = namedtuple("Fact", "sentence number keyword value start end")
+
+
+def number_to_int(number):
+    try:
+        return int(number.replace("%", ""))
+    except ValueError:
+        return None
+
+
+def extract_facts(text, analysis):
+    """(number, stem of the neighbouring word) facts read off a text's precomputed analysis."""
+    tokens, stems, starts = analysis["tokens"], analysis["stems"], analysis["token_starts"]
+    numbers = set(analysis["numbers"])
+    sentence_of = token_sentences(analysis, "fact_sentences")
+    spans = analysis["fact_sentences"]
+    facts = []
+    for i in range(len(tokens) - 1):
+        if sentence_of[i] != sentence_of[i + 1]:
+            continue
+        if i in numbers:
+            number, keyword = tokens[i], stems[i + 1]
+        elif i + 1 in numbers:
+            number, keyword = tokens[i + 1], stems[i]
+        else:
+            continue
+        start, end = spans[sentence_of[i]]
+        facts.append(Fact(text[start:end], number, keyword, number_to_int(number),
+                          starts[i], TOKEN_PATTERN.match(text, starts[i + 1]).end()))
+    return facts
+
+
+class FactIndex:
+    """Numeric values of a set of facts, bucketed by keyword stem and sorted for window lookups."""
+
+    def __init__(self, facts):
+        buckets = defaultdict(list)
+        for fact in facts:
+            if fact.value is not None:
+                buckets[fact.keyword].append(fact.value)
+        self.values = {keyword: sorted(values) for keyword, values in buckets.items()}
+
+    def has_match(self, fact, max_delta):
+        """True if some indexed fact shares the keyword and is within max_delta of the value."""
+        values = self.values.get(fact.keyword)
+        if fact.value is None or not values:
+            return False
+        i = bisect_left(values, fact.value - max_delta)
+        return i < len(values) and values[i] <= fact.value + max_delta
+
+
+def match_facts(facts_a, facts_b, max_delta):
+    """Per-fact matched flags for both sides: same keyword stem and numbers at most max_delta apart."""
+    index_a, index_b = FactIndex(facts_a), FactIndex(facts_b)
+    return ([index_b.has_match(fact, max_delta) for fact in facts_a],
+            [index_a.has_match(fact, max_delta) for fact in facts_b])
+
+
+def highlight_facts(text, analysis, facts, matched):
+    """
+    Wrap every fact in <span class='matched'> or <span class='unmatched'> in one left-to-right
+    pass over the offsets captured at extraction. Overlapping facts (a number shared by the
+    words on both sides of it) merge into one span, and matched wins.
+    """
+    if analysis["text_length"] != len(text):
+        # an analysis of some other text; its offsets do not apply
+        return text
+    spans = [(fact.start, fact.end, "matched" if ok else "unmatched") for fact, ok in zip(facts, matched)]
+
+    merged = []
+    for start, end, css in sorted(spans):
+        if merged and start < merged[-1][1]:
+            last = merged[-1]
+            merged[-1] = (last[0], max(last[1], end), "matched" if "matched" in (last[2], css) else css)
+        else:
+            merged.append((start, end, css))
+
+    pieces = []
+    position = 0
+    for start, end, css in merged:
+        pieces.append(text[position:start])
+        pieces.append(f"<span class='{css}'>{text[start:end]}</span>")
+        position = end
+    pieces.append(text[position:])
+    return "".join(pieces)
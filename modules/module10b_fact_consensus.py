@@ -0,0 +1,171 @@
+# modules/module10b_fact_consensus.py
+
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict, namedtuple
+from statistics import median
+
+from modules.module1e_text_analysis import get_analysis, token_sentences
+from modules.module2c_domain_index import get_host
+
+# Words that say nothing about what a number counts; the word on the other side is used instead
+FILLER_WORDS = frozenset("""
+a an the and or but of in on at to for by with from as than that this these those which who
+about around over under nearly almost least more less some another other only just up down
+is are was were be been being has have had said says say told per out into since after before
+""".split())
+
+SCALE_WORDS = {"thousand": 1000, "million": 1000000, "billion": 1000000000}
+
+DEFAULT_TOLERANCE = 0.1
+MIN_OUTLETS = 2
+
+# One number in one article: `unit` is the stem of the word it counts, `word` that word as written
+NumericFact = namedtuple("NumericFact", "value unit word article start sentence")
+
+
+def article_label(article):
+    host = get_host(article.get("url") or "")
+    return host[4:] if host.startswith("www.") else host or (article.get("title") or "?")
+
+
+def read_number(text, tokens, starts, i):
+    """
+    The number that starts at token i, rejoined from the pieces the tokenizer splits it into
+    ("1,200" is "1" and "200", "2.5" is "2" and "5"), and the index of its last token.
+    Returns (None, i) if token i is not a plain number.
+    """
+    if not tokens[i].isdigit():
+        return None, i
+    digits = tokens[i]
+    decimals = ""
+    j = i
+    while j + 1 < len(tokens) and tokens[j + 1].isdigit():
+        separator = text[starts[j] + len(tokens[j]):starts[j + 1]]
+        if separator == "," and len(tokens[j + 1]) == 3 and not decimals:
+            digits += tokens[j + 1]
+        elif separator == "." and not decimals:
+            decimals = tokens[j + 1]
+        else:
+            break
+        j += 1
+    value = int(digits) if not decimals else float(f"{digits}.{decimals}")
+    return value, j
+
+
+def numeric_facts(text, analysis, article_id):
+    """
+    Every number in a text with the word it counts: the next word, or the previous one if
+    that is filler. Grouped and decimal numbers are read whole, and a following scale word
+    multiplies them ("2.5 million people" counts 2,500,000 people).
+    """
+    tokens, stems, starts = analysis["tokens"], analysis["stems"], analysis["token_starts"]
+    sentence_of = token_sentences(analysis, "fact_sentences")
+    spans = analysis["fact_sentences"]
+    facts = []
+    last = -1
+    for i in analysis["numbers"]:
+        if i <= last:
+            continue  # a later piece of a number already read
+        value, last = read_number(text, tokens, starts, i)
+        if value is None:
+            continue
+        after = last + 1
+        if after < len(tokens) and sentence_of[after] == sentence_of[i] and tokens[after] in SCALE_WORDS:
+            value *= SCALE_WORDS[tokens[after]]
+            after += 1
+        if value == int(value):
+            value = int(value)
+        unit = None
+        for j in (after, i - 1):
+            if (0 <= j < len(tokens) and sentence_of[j] == sentence_of[i] and tokens[j].isalpha()
+                    and tokens[j] not in FILLER_WORDS):
+                unit = j
+                break
+        if unit is None:
+            continue
+        start, end = spans[sentence_of[i]]
+        facts.append(NumericFact(value, stems[unit], tokens[unit], article_id, starts[i], text[start:end]))
+    return facts
+
+
+class NumericFactIndex:
+    """
+    Numeric facts of a whole corpus, built in one pass over each article's analysis and
+    bucketed by unit stem with values sorted, so any value window is two bisects.
+    """
+
+    def __init__(self, articles):
+        self.articles = articles
+        self.labels = [article_label(article) for article in articles]
+        buckets = defaultdict(list)
+        for article_id, article in enumerate(articles):
+            text = article.get("text") or ""
+            if not text:
+                continue
+            for fact in numeric_facts(text, get_analysis(article), article_id):
+                buckets[fact.unit].append(fact)
+        self.facts = {unit: sorted(facts) for unit, facts in buckets.items()}
+        self._values = {unit: [fact.value for fact in facts] for unit, facts in self.facts.items()}
+
+    def __len__(self):
+        return sum(len(facts) for facts in self.facts.values())
+
+    def window(self, unit, low, high):
+        """Facts about `unit` with low <= value <= high."""
+        values = self._values.get(unit, [])
+        return self.facts.get(unit, [])[bisect_left(values, low):bisect_right(values, high)]
+
+    def groups(self, unit, max_delta=0, tolerance=DEFAULT_TOLERANCE):
+        """
+        Split a unit's facts into groups of compatible values: sorted values chain together
+        while each is within max(max_delta, tolerance × value) of the previous one.
+        """
+        groups = []
+        for fact in self.facts.get(unit, []):
+            if groups and fact.value - groups[-1][-1].value <= max(max_delta, tolerance * fact.value):
+                groups[-1].append(fact)
+            else:
+                groups.append([fact])
+        return groups
+
+    def consensus(self, max_delta=0, tolerance=DEFAULT_TOLERANCE, min_outlets=MIN_OUTLETS):
+        """
+        One entry per unit reported by at least `min_outlets` outlets: the group of compatible
+        values backed by the most outlets is the consensus, and outlets that only report values
+        outside it are flagged as outliers, once each (an outlet that also gives the consensus
+        value is taken to be counting something else). Several articles from one outlet count
+        once. Entries are sorted by how many outlets report the unit.
+        """
+        labels = self.labels
+        results = []
+        for unit, facts in self.facts.items():
+            outlets = {labels[fact.article] for fact in facts}
+            if len(outlets) < min_outlets:
+                continue
+            groups = self.groups(unit, max_delta, tolerance)
+            best = max(groups, key=lambda group: (len({labels[fact.article] for fact in group}), len(group)))
+            agreeing = {labels[fact.article] for fact in best}
+            if len(agreeing) < min_outlets:
+                # no value is backed by two outlets, so there is nothing to call an outlier
+                continue
+            outliers = {}
+            for group in groups:
+                if group is best:
+                    continue
+                for fact in group:
+                    outlet = labels[fact.article]
+                    if outlet not in agreeing and outlet not in outliers:
+                        outliers[outlet] = {"outlet": outlet, "value": fact.value, "sentence": fact.sentence,
+                                            "url": self.articles[fact.article].get("url")}
+            results.append({
+                "unit": unit,
+                "word": Counter(fact.word for fact in facts).most_common(1)[0][0],
+                "value": median(fact.value for fact in best),
+                "low": best[0].value,
+                "high": best[-1].value,
+                "outlets": sorted(agreeing),
+                "reporting": len(outlets),
+                "outliers": list(outliers.values()),
+            })
+        results.sort(key=lambda entry: (-entry["reporting"], -len(entry["outliers"]), entry["unit"]))
+        return results
@@ -0,0 +1,78 @@
+# modules/module11_results_table.py
+
+from modules.module0_model_registry import lazy_import
+
+PAGE_SIZE = 20
+VERDICTS = ["Likely Same Incident", "Possibly Related", "Unlikely Related"]
+ARTICLE_COLUMNS = ["title", "url", "verdict", "entity_score", "title_score", "same_date_window",
+                   "publish_date", "mirrors"]
+
+
+class ResultsTable:
+    """
+    Scored results in columnar form: one row per article (without bodies) and one row per
+    matched sentence, linked by the article's position. Built once per analysis run; every
+    filter is a boolean mask over these two frames.
+    """
+
+    def __init__(self, core_results):
+        pd = lazy_import("pandas")
+        self.articles = pd.DataFrame({
+            "title": [r.get("title") or "" for r in core_results],
+            "url": [r.get("url") for r in core_results],
+            "verdict": pd.Categorical([r.get("verdict") for r in core_results], categories=VERDICTS),
+            "entity_score": [float(r.get("entity_score", 0)) for r in core_results],
+            "title_score": [float(r.get("title_score", 0)) for r in core_results],
+            "same_date_window": [bool(r.get("same_date_window")) for r in core_results],
+            "publish_date": [r.get("publish_date") for r in core_results],
+            "mirrors": [", ".join(m["domain"] for m in r.get("mirrors") or []) for r in core_results],
+        }, columns=ARTICLE_COLUMNS)
+        rows = [(i, m.get("phrase") or "Unknown", float(m["score"]), m["sentence"])
+                for i, r in enumerate(core_results) for m in r.get("matches", [])]
+        self.matches = pd.DataFrame(rows, columns=["article", "phrase", "score", "sentence"])
+        self.matches["phrase"] = self.matches["phrase"].astype("category")
+        self.phrases = sorted(self.matches["phrase"].cat.categories)
+        self._csv = (None, None)
+
+    def filter(self, verdict="All", entity_range=(0, 100), title_range=(0, 100), date_nearby="All",
+               min_score=0, phrases=None):
+        """
+        (articles, matches) frames left after the sidebar filters. An article filtered to
+        "Unlikely Related" is only kept if some of its sentences still match.
+        """
+        articles = self.articles
+        mask = articles["entity_score"].between(*entity_range) & articles["title_score"].between(*title_range)
+        if verdict != "All":
+            mask &= articles["verdict"] == verdict
+        if date_nearby != "All":
+            mask &= articles["same_date_window"] == date_nearby
+
+        matches = self.matches
+        match_mask = matches["score"] >= min_score
+        if phrases:
+            match_mask &= matches["phrase"].isin(phrases)
+        matches = matches[match_mask & matches["article"].map(mask).to_numpy()]
+
+        if verdict == "Unlikely Related":
+            mask &= articles.index.isin(matches["article"].unique())
+        return articles[mask], matches
+
+    @staticmethod
+    def page(articles, number, size=PAGE_SIZE):
+        """One page (numbered from 1) of the filtered articles."""
+        return articles.iloc[(number - 1) * size:number * size]
+
+    def filtered_csv(self, verdict="All", entity_range=(0, 100), title_range=(0, 100), date_nearby="All",
+                     min_score=0, phrases=None):
+        """to_csv() of a filter() result, serialized again only when the filters change."""
+        key = (verdict, tuple(entity_range), tuple(title_range), date_nearby, min_score, tuple(sorted(phrases or ())))
+        if self._csv[0] != key:
+            articles, matches = self.filter(verdict, entity_range, title_range, date_nearby, min_score, phrases)
+            self._csv = (key, self.to_csv(articles, matches))
+        return self._csv[1]
+
+    @staticmethod
+    def to_csv(articles, matches):
+        """CSV export with one row per matched sentence, plus one row for each article without matches."""
+        joined = articles.join(matches.set_index("article"), how="left")
+        return joined.rename_axis("article").reset_index().to_csv(index=False).encode("utf-8")
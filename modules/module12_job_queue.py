@@ -0,0 +1,242 @@
+# modules/module12_job_queue.py
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from modules.module1c_article_cache import CACHE_DIR, normalize_url
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+JOB_WORKERS = int(os.getenv("ECHOLENS_JOB_WORKERS", 4))
+# A finished job is handed to identical submissions for this long instead of running again
+RESULT_TTL = int(os.getenv("ECHOLENS_JOB_TTL", 10 * 60))
+# Finished results held for reuse; results younger than RESULT_TTL are never dropped, since
+# sessions that joined the job may not have read them yet
+MAX_RESULTS = 64
+KEEP_DAYS = 7
+
+PENDING = ("queued", "running")
+STATUS_COLUMNS = ("id", "kind", "url", "claim", "status", "progress", "message", "partial", "error",
+                  "created_at", "updated_at")
+
+
+def job_key(kind, url, claim=None, options=None):
+    """Job id for (kind, URL, claim, options): identical requests get the same id."""
+    claim = re.sub(r"\s+", " ", claim).strip() if claim else None
+    url = normalize_url(url) if url else ""
+    payload = json.dumps([kind, url, claim, options or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def process_owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_alive(owner):
+    """False only for an owner on this host whose process is known to have exited."""
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit() or os.name == "nt":
+        # other hosts can't be checked, and os.kill() on Windows would terminate the process
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _status_dict(row):
+    status = dict(zip(STATUS_COLUMNS, row))
+    status["partial"] = json.loads(status["partial"]) if status["partial"] else []
+    return status
+
+
+class JobQueue:
+    """
+    Local worker pool for long analysis steps. Job state and progress are kept in SQLite so
+    any session (or the dashboard) can poll them; results stay in memory with the pool.
+    Jobs are keyed by job_key(), so a request identical to one in flight (or finished within
+    RESULT_TTL) joins that job instead of starting another. Each job row records the process
+    that runs it; at start-up, pending jobs whose process on this host has exited are marked
+    'interrupted'.
+    """
+
+    def __init__(self, path=None, workers=JOB_WORKERS, ttl=RESULT_TTL, max_results=MAX_RESULTS):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "jobs.sqlite3")
+        self.ttl = ttl
+        self.max_results = max_results
+        self.owner = process_owner()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="echolens-job")
+        self._futures = OrderedDict()
+        self._finished_at = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                url TEXT,
+                claim TEXT,
+                options TEXT,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                message TEXT,
+                partial TEXT,
+                error TEXT,
+                owner TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        for column in ("partial", "owner"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+        now = time.time()
+        stale = [(now, job_id) for job_id, owner in self._conn.execute(
+            "SELECT id, owner FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchall() if not owner_alive(owner)]
+        self._conn.executemany("UPDATE jobs SET status = 'interrupted', updated_at = ? WHERE id = ?", stale)
+        self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (now - KEEP_DAYS * 86400,))
+        self._conn.commit()
+
+    def _write(self, sql, params):
+        with self._db_lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def submit(self, kind, func, url, claim=None, options=None, args=(), kwargs=None):
+        """
+        Run func(*args, progress=callback, **kwargs) in the pool and return the job id.
+        `callback(fraction, message, partial=None)` records progress; `partial` is an optional
+        JSON-serializable list of what the job has produced so far, shown while polling.
+        Identical jobs are coalesced.
+        """
+        job_id = job_key(kind, url, claim, options)
+        with self._lock:
+            future = self._futures.get(job_id)
+            if future is not None and self._reusable(job_id, future):
+                logging.info(f"Joining job {kind} {job_id} for {url}")
+                return job_id
+            # the row is written before the future is published, so a session joining the job
+            # always finds its status
+            now = time.time()
+            self._write(
+                "INSERT OR REPLACE INTO jobs (id, kind, url, claim, options, status, progress, message, partial, "
+                "error, owner, created_at, updated_at) VALUES (?, ?, ?, ?, ?, 'queued', 0, NULL, NULL, NULL, ?, ?, ?)",
+                (job_id, kind, url, claim, json.dumps(options or {}, sort_keys=True, default=str),
+                 self.owner, now, now)
+            )
+            future = Future()
+            self._futures[job_id] = future
+            self._finished_at.pop(job_id, None)
+            self._evict()
+
+        logging.info(f"Queued job {kind} {job_id} for {url}")
+        self._executor.submit(self._run, job_id, future, func, args, kwargs or {})
+        return job_id
+
+    def _reusable(self, job_id, future):
+        if not future.done():
+            return True
+        if future.exception() is not None:
+            return False
+        return time.time() - self._finished_at.get(job_id, 0) < self.ttl
+
+    def _evict(self):
+        """Drop the oldest finished results past RESULT_TTL once more than max_results are held."""
+        expired = time.time() - self.ttl
+        finished = [job_id for job_id, future in self._futures.items()
+                    if future.done() and self._finished_at.get(job_id, 0) < expired]
+        for job_id in finished[:max(0, len(self._futures) - self.max_results)]:
+            del self._futures[job_id]
+            self._finished_at.pop(job_id, None)
+
+    def _run(self, job_id, future, func, args, kwargs):
+        def progress(fraction, message=None, partial=None):
+            self._write("UPDATE jobs SET progress = ?, message = ?, partial = COALESCE(?, partial), updated_at = ? "
+                        "WHERE id = ?", (min(max(float(fraction), 0.0), 1.0), message,
+                                         None if partial is None else json.dumps(partial), time.time(), job_id))
+
+        self._write("UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ?", (time.time(), job_id))
+        try:
+            result = func(*args, progress=progress, **kwargs)
+        except Exception as e:
+            logging.error(f"Job {job_id} failed: {e}")
+            self._write("UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                        (str(e) or type(e).__name__, time.time(), job_id))
+            with self._lock:
+                self._finished_at[job_id] = time.time()
+            future.set_exception(e)
+            return
+        self._write("UPDATE jobs SET status = 'done', progress = 1, updated_at = ? WHERE id = ?",
+                    (time.time(), job_id))
+        with self._lock:
+            self._finished_at[job_id] = time.time()
+        future.set_result(result)
+        logging.info(f"Job {job_id} done")
+
+    def status(self, job_id):
+        """The job's persisted state as a dict, or None for an unknown id."""
+        with self._db_lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(STATUS_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return _status_dict(row) if row else None
+
+    def result(self, job_id, timeout=None):
+        """
+        The job's return value (waiting up to `timeout` seconds; None means don't wait).
+        Re-raises the job's exception; returns None if it is still running or its result is gone.
+        Every caller gets its own deep copy, so sessions that joined one job never share state.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is None:
+            return None
+        if timeout is None and not future.done():
+            return None
+        return copy.deepcopy(future.result(timeout))
+
+    def jobs(self, statuses=PENDING):
+        """Persisted state of every job in one of `statuses`, oldest first."""
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(STATUS_COLUMNS)} FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+                tuple(statuses)
+            ).fetchall()
+        return [_status_dict(row) for row in rows]
+
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+
+def get_job_queue():
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue()
+        return _default_queue
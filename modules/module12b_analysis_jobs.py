@@ -0,0 +1,116 @@
+# modules/module12b_analysis_jobs.py
+
+import threading
+from collections import OrderedDict
+
+from modules.module1_article_ingestion import NewsArticle
+from modules.module2_search_fallback import search_related_multi
+from modules.module3c_near_duplicates import collapse_near_duplicates
+from modules.module4b_sentence_index import get_sentence_index
+from modules.module8_streaming_pipeline import iter_fetch_records, stream_analysis
+from modules.module9_article_store import get_article_store
+from modules.module12_job_queue import get_job_queue
+
+# Incident scores depend only on the original and the corpus, so they are kept per store
+# session for the most recent extractions and shared by every analysis of that corpus
+MAX_INCIDENT_CACHES = 32
+
+_incident_caches = OrderedDict()
+_incident_lock = threading.Lock()
+
+
+def incident_cache(session):
+    """The {url: incident fields} dict owned by the job layer for one extracted corpus."""
+    with _incident_lock:
+        cache = _incident_caches.get(session)
+        if cache is None:
+            cache = _incident_caches[session] = {}
+        _incident_caches.move_to_end(session)
+        while len(_incident_caches) > MAX_INCIDENT_CACHES:
+            _incident_caches.popitem(last=False)
+        return cache
+
+
+def extract_corpus(url, progress):
+    """
+    Extract the article at `url` and its related coverage, save both to the article store and
+    warm the sentence index. Returns {original, related, session, extracted, failed}.
+    """
+    progress(0.0, "Extracting original article...")
+    article = NewsArticle(url).extract()
+    original = article.to_dict()
+
+    progress(0.05, "Searching for related articles...")
+    # The title and a relaxed 6-word query run concurrently; the relaxed results are only used
+    # if the title finds fewer than 5 outlets. Both are cached and coalesced across sessions
+    relaxed_query = " ".join(article.title.split()[:6])
+    related_urls = search_related_multi([article.title, relaxed_query])
+
+    related = []
+    failed = 0
+    for done, record in enumerate(iter_fetch_records(related_urls), start=1):
+        if record["error"]:
+            failed += 1
+        else:
+            related.append(record["article"])
+        # titles are published as they arrive, so the app can list each article as its site responds
+        progress(0.1 + 0.8 * done / len(related_urls),
+                 f"Extracted {len(related)} of {len(related_urls)} related articles...",
+                 [a["title"] for a in related])
+
+    order = {u: i for i, u in enumerate(related_urls)}
+    related.sort(key=lambda a: order.get(a["url"], len(order)))
+    # Wire copies are scored once, through the highest-ranked outlet that ran them
+    extracted = len(related)
+    related = collapse_near_duplicates(related)
+
+    progress(0.9, "Indexing sentences...")
+    store = get_article_store()
+    session = store.save([original], "original")
+    store.save(related, "related", session)
+    get_sentence_index(related)
+    return {"original": original, "related": related, "session": session,
+            "extracted": extracted, "failed": failed}
+
+
+def analyze_corpus(related, claim_input, original, threshold, exact_match, mode, session, progress):
+    """Claim comparison and incident matching over an extracted corpus. Returns {match_results, core_results}."""
+    incidents = incident_cache(session)
+    match_results = []
+    core_results = []
+    verdicts = []
+    for done, (match_result, core_result) in enumerate(stream_analysis(
+            related,
+            claim_input,
+            original,
+            threshold=threshold,
+            exact_match=exact_match,
+            index=get_sentence_index(related),
+            mode=mode,
+            incidents=incidents), start=1):
+        match_results.append(match_result)
+        if core_result is not None:
+            core_results.append(core_result)
+            verdicts.append(f"**{core_result['verdict']}** · {core_result['title']} "
+                            f"({len(core_result.get('matches', []))} matches)")
+        progress(done / len(related), f"Analyzed {done} of {len(related)} articles...", verdicts)
+    return {"match_results": match_results, "core_results": core_results}
+
+
+def submit_extraction(url):
+    """Queue extract_corpus for `url`; analysts asking for the same URL share one run."""
+    url = url.strip()
+    return get_job_queue().submit("extract", extract_corpus, url, args=(url,))
+
+
+def submit_analysis(corpus, claim_input, threshold=60, exact_match=False, mode="fuzzy"):
+    """
+    Queue analyze_corpus over the result of an extraction job. The corpus is identified by its
+    store session, so analysts who shared the extraction also share identical analyses and
+    its incident scores.
+    """
+    options = {"session": corpus["session"], "threshold": threshold, "exact_match": exact_match, "mode": mode}
+    return get_job_queue().submit(
+        "analyze", analyze_corpus, corpus["original"].get("url") or "", claim_input, options,
+        args=(corpus["related"], claim_input, corpus["original"], threshold, exact_match, mode, corpus["session"])
+    )
@@ -2,10 +2,17 @@
 
 import json
 import logging
-import re
-from newspaper import Article
-from dateutil.parser import parse
-from datetime import datetime, timedelta
+
+import requests
+
+from modules.module0_model_registry import lazy_import
+from modules.module1b_page_fetch import fetch_page
+from modules.module1c_article_cache import get_article_cache
+from modules.module1d_date_extraction import extract_date_from_text, extract_date_from_url
+from modules.module1e_text_analysis import cached_analysis
+
+# Responses meaning the article is gone for good; its cache entry is dropped rather than served
+GONE_STATUSES = (404, 410)
 
 logging.basicConfig(
     filename='echolens.log',
@@ -30,11 +37,77 @@ class NewsArticle:
         self.__publish_date = None
         self.__text = None
         self.__top_image = None
+        self.__analysis = None
 
     @log_action
-    def extract(self):
-        article = Article(self.__url)
-        article.download()
+    def extract(self, html=None, use_cache=True, **fetch_options):
+        """
+        Download and parse the article, or parse pre-fetched `html` if given.
+        Network fetches go through the shared article cache: fresh entries skip the
+        network and parser entirely, stale ones are revalidated with ETag/Last-Modified.
+        `fetch_options` are passed on to fetch_page (timeouts, max_bytes, session).
+        """
+        if html is not None:
+            return self._parse_html(html)
+
+        cache = get_article_cache() if use_cache else None
+        payload, page = self.download(cache, **fetch_options)
+        if payload is not None:
+            return self._load(payload)
+
+        self._parse_html(page.html)
+        if cache is not None:
+            cache.put(self.__url, self.to_dict(), page.etag, page.last_modified)
+        return self
+
+    def download(self, cache=None, **fetch_options):
+        """
+        I/O stage of extract(): returns (payload, None) when the cache can answer,
+        otherwise (None, FetchedPage) with raw html still to be parsed. A stale entry is
+        served as is when revalidation fails on a connection error, timeout or 5xx response,
+        and evicted when the site answers 404/410.
+        """
+        entry = cache.lookup(self.__url) if cache is not None else None
+        if entry and entry["fresh"]:
+            logging.info(f"Article cache hit: {self.__url}")
+            return entry["payload"], None
+
+        try:
+            page = fetch_page(
+                self.__url,
+                etag=entry["etag"] if entry else None,
+                last_modified=entry["last_modified"] if entry else None,
+                **fetch_options
+            )
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            if not entry:
+                raise
+            status = e.response.status_code if e.response is not None else None
+            if status in GONE_STATUSES:
+                logging.warning(f"Article is gone ({status}), dropping its cache entry: {self.__url}")
+                cache.delete(self.__url)
+                raise
+            if status is not None and status < 500:
+                raise
+            logging.warning(f"Revalidation failed, serving stale cache entry for {self.__url}: {e}")
+            return entry["payload"], None
+        if page.not_modified and entry:
+            logging.info(f"Article not modified, cache revalidated: {self.__url}")
+            cache.touch(self.__url)
+            return entry["payload"], None
+
+        return None, page
+
+    @classmethod
+    def from_html(cls, url, html):
+        """Build an article from already-downloaded html without touching the network."""
+        return cls(url)._parse_html(html)
+
+    def _parse_html(self, html):
+        # newspaper is imported on the first parse; cached articles never need it
+        article = lazy_import("newspaper").Article(self.__url)
+        # never let newspaper fall back to its own download
+        article.download(input_html=html or "")
         article.parse()
 
         self.__title = article.title
@@ -57,62 +130,33 @@ class NewsArticle:
                     print(f"⚠️ No publish date found for: {self.__url}")
                     logging.warning(f"No publish date found for: {self.__url}")
 
+        self.__analysis = cached_analysis(self.__text)
         return self
 
+    def _load(self, data):
+        self.__title = data.get('title')
+        self.__authors = data.get('authors') or []
+        self.__publish_date = data.get('publish_date')
+        self.__text = data.get('text')
+        self.__top_image = data.get('top_image')
+        # payloads carry no analysis; it comes back from the content-hash analysis cache
+        self.__analysis = cached_analysis(self.__text)
+        return self
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a NewsArticle from a to_dict() payload."""
+        return cls(data['url'])._load(data)
+
     def extract_date_fallback(self):
-        if not self.__text:
-            return None
-
-        header_chunk = self.__text[:500]
-
-        # Handle absolute dates
-        absolute_patterns = [
-            r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-            r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2},?\s+\d{4}",
-            r"\b\d{1,2}\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-            r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{4}",
-            r"\b\d{4}-\d{2}-\d{2}"
-        ]
-
-        for pattern in absolute_patterns:
-            match = re.search(pattern, header_chunk)
-            if match:
-                try:
-                    parsed_date = parse(match.group())
-                    return str(parsed_date.date())
-                except:
-                    continue
-
-        # Handle relative dates like "2 days ago", "5 hours ago"
-        rel_pattern = r"(\d+)\s+(day|hour|minute)s?\s+ago"
-        match = re.search(rel_pattern, header_chunk, re.IGNORECASE)
-        if match:
-            num = int(match.group(1))
-            unit = match.group(2).lower()
-            try:
-                if unit == "day":
-                    return str((datetime.now() - timedelta(days=num)).date())
-                elif unit == "hour":
-                    return str((datetime.now() - timedelta(hours=num)).date())
-                elif unit == "minute":
-                    return str((datetime.now() - timedelta(minutes=num)).date())
-            except:
-                pass
-
-        return None
+        return extract_date_from_text(self.__text)
 
     def extract_date_from_url(self):
-        match = re.search(r"(\d{4})[/-](\d{2})[/-](\d{2})", self.__url)
-        if not match:
-            match = re.search(r"/(\d{4})/(\d{2})/(\d{2})/", self.__url)
-        if match:
-            try:
-                return str(parse("-".join(match.groups())).date())
-            except:
-                return None
-        return None
+        return extract_date_from_url(self.__url)
 
     def to_dict(self) -> dict:
+        # analysis is left out: it lives only in the analysis cache, keyed by the text's hash,
+        # and get_analysis() attaches it again wherever it is needed
         return {
             'url': self.__url,
             'title': self.__title,
@@ -141,3 +185,10 @@ class NewsArticle:
     def text(self): return self.__text
     @property
     def top_image(self): return self.__top_image
+    @property
+    def analysis(self): return self.__analysis
+
+
+def parse_html(url, html):
+    """CPU stage of extract(): parse raw html into a to_dict() payload (process-pool safe)."""
+    return NewsArticle.from_html(url, html).to_dict()
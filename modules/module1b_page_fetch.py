@@ -0,0 +1,88 @@
+# modules/module1b_page_fetch.py
+
+import logging
+import time
+from collections import namedtuple
+
+import requests
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; EchoLens/1.0)",
+    "Accept": "text/html,application/xhtml+xml",
+}
+
+FetchedPage = namedtuple("FetchedPage", ["html", "etag", "last_modified", "not_modified"])
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+def fetch_page(url, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+               max_bytes=MAX_RESPONSE_BYTES, session=None, etag=None, last_modified=None):
+    """
+    Download a page with hard timeouts and a size ceiling.
+    `read_timeout` also bounds the total body transfer, so slow-drip pages are cut off.
+    Passing `etag` / `last_modified` makes the request conditional; a 304 comes back
+    as a FetchedPage with `not_modified=True` and no html. Every failure is logged
+    here before it is raised, whoever the caller is.
+    """
+    try:
+        return _fetch_page(url, connect_timeout, read_timeout, max_bytes, session, etag, last_modified)
+    except Exception as e:
+        logging.warning(f"Download failed for {url}: {type(e).__name__}: {e}")
+        raise
+
+
+def _fetch_page(url, connect_timeout, read_timeout, max_bytes, session, etag, last_modified):
+    getter = session.get if session is not None else requests.get
+    deadline = time.monotonic() + connect_timeout + read_timeout
+
+    headers = dict(HEADERS)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    with getter(url, headers=headers, timeout=(connect_timeout, read_timeout), stream=True) as response:
+        if response.status_code == 304:
+            return FetchedPage(None, etag, last_modified, True)
+        response.raise_for_status()
+
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise ResponseTooLarge(f"{declared} bytes exceeds limit of {max_bytes}")
+
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            received += len(chunk)
+            if received > max_bytes:
+                raise ResponseTooLarge(f"body exceeds limit of {max_bytes} bytes")
+            if time.monotonic() > deadline:
+                raise requests.Timeout(f"download exceeded {connect_timeout + read_timeout}s")
+            chunks.append(chunk)
+
+        body = b"".join(chunks)
+        # requests falls back to ISO-8859-1 when no charset is declared; prefer UTF-8 then
+        if "charset" in response.headers.get("Content-Type", "").lower():
+            html = body.decode(response.encoding, errors="replace")
+        else:
+            try:
+                html = body.decode("utf-8")
+            except UnicodeDecodeError:
+                html = body.decode("cp1252", errors="replace")
+
+        return FetchedPage(html, response.headers.get("ETag"), response.headers.get("Last-Modified"), False)
+
@@ -0,0 +1,151 @@
+# modules/module1c_article_cache.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+CACHE_DIR = os.getenv("ECHOLENS_CACHE_DIR", ".echolens_cache")
+DEFAULT_TTL = int(os.getenv("ECHOLENS_ARTICLE_TTL", 6 * 60 * 60))
+DEFAULT_MAX_ENTRIES = int(os.getenv("ECHOLENS_ARTICLE_CACHE_SIZE", 5000))
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "cmpid", "smid", "ref"}
+
+
+def normalize_url(url):
+    """Canonical cache key: lowercase host, no www., fragment or tracking params, no trailing slash."""
+    parts = urlparse(url.strip())
+    netloc = parts.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS]
+    path = parts.path.rstrip("/") or "/"
+    return urlunparse((parts.scheme.lower() or "https", netloc, path, "", urlencode(sorted(query)), ""))
+
+
+class ArticleCache:
+    """
+    On-disk article cache (SQLite) keyed by normalized URL.
+    Entries younger than `ttl` are served directly; older ones keep their ETag/Last-Modified
+    so the caller can revalidate. The least recently used entries are evicted past `max_entries`.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "articles.sqlite3")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_accessed ON articles (accessed_at)")
+        self._conn.commit()
+
+    def lookup(self, url):
+        """Return {payload, etag, last_modified, fresh} for a cached URL, or None."""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, etag, last_modified, fetched_at FROM articles WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE articles SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        payload, etag, last_modified, fetched_at = row
+        return {
+            "payload": json.loads(payload),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": now - fetched_at < self.ttl,
+        }
+
+    def get(self, url):
+        """Return the cached payload only if it is still within the TTL."""
+        entry = self.lookup(url)
+        return entry["payload"] if entry and entry["fresh"] else None
+
+    def put(self, url, payload, etag=None, last_modified=None):
+        # an analysis attached downstream is already in the analysis cache; don't store it twice
+        payload = {key: value for key, value in payload.items() if key != "analysis"}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles (key, payload, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), json.dumps(payload), etag, last_modified, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, url):
+        with self._lock:
+            self._conn.execute("DELETE FROM articles WHERE key = ?", (normalize_url(url),))
+            self._conn.commit()
+
+    def touch(self, url):
+        """Mark an entry as freshly revalidated (e.g. after a 304 Not Modified)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE articles SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, normalize_url(url))
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM articles WHERE key IN "
+                "(SELECT key FROM articles ORDER BY accessed_at ASC LIMIT ?)", (overflow,)
+            )
+            logging.info(f"Article cache evicted {overflow} entries")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM articles")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_article_cache():
+    """Process-wide cache shared by the CLI, the Streamlit apps and extract_related_articles."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ArticleCache()
+        return _default_cache
@@ -0,0 +1,162 @@
+# modules/module1d_date_extraction.py
+
+import re
+from datetime import date, datetime, timedelta
+
+HEADER_CHARS = 500
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_MONTH = (r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+          r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)")
+
+# One alternation covering every supported form, so a header is scanned exactly once.
+# Group names double as priority: month-day-year beats day-month-year beats ISO beats relative.
+# The leading lookahead rejects most positions with a single character-class test.
+DATE_SCANNER = re.compile(
+    r"(?=[JFMASOND0-9])(?:"
+    r"\b(?P<mdy_m>" + _MONTH + r")\s+(?P<mdy_d>\d{1,2}),?\s+(?P<mdy_y>\d{4})"
+    r"|\b(?P<dmy_d>\d{1,2})\s+(?P<dmy_m>" + _MONTH + r")\s+(?P<dmy_y>\d{4})"
+    r"|\b(?P<iso_y>\d{4})-(?P<iso_m>\d{2})-(?P<iso_d>\d{2})"
+    r"|(?P<rel_n>\d+)\s+(?P<rel_u>(?i:day|hour|minute))(?i:s)?\s+(?i:ago)"
+    r")"
+)
+URL_DATE = re.compile(r"(\d{4})[/-](\d{2})[/-](\d{2})")
+ISO_PREFIX = re.compile(r"^\s*(\d{4})-(\d{2})-(\d{2})")
+
+KINDS = ("mdy", "dmy", "iso", "rel")
+RELATIVE_UNITS = {"day": "days", "hour": "hours", "minute": "minutes"}
+
+
+def _safe_date(year, month, day):
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _match_kind(match):
+    for kind in KINDS:
+        if match.group(kind + "_" + ("n" if kind == "rel" else "y")) is not None:
+            return kind
+    return None
+
+
+def _match_date(match, kind):
+    if kind == "mdy":
+        return _safe_date(match.group("mdy_y"), MONTHS[match.group("mdy_m")[:3].lower()], match.group("mdy_d"))
+    if kind == "dmy":
+        return _safe_date(match.group("dmy_y"), MONTHS[match.group("dmy_m")[:3].lower()], match.group("dmy_d"))
+    if kind == "iso":
+        return _safe_date(match.group("iso_y"), match.group("iso_m"), match.group("iso_d"))
+    unit = RELATIVE_UNITS[match.group("rel_u").lower()]
+    try:
+        return (datetime.now() - timedelta(**{unit: int(match.group("rel_n"))})).date()
+    except OverflowError:
+        return None
+
+
+def _best_date(matches):
+    """Pick the first valid date of the highest-priority kind among a header's matches."""
+    found = {}
+    for match in matches:
+        kind = _match_kind(match)
+        if kind in found:
+            continue
+        parsed = _match_date(match, kind)
+        if parsed:
+            found[kind] = parsed
+            if kind == "mdy":
+                break
+    for kind in KINDS:
+        if kind in found:
+            return str(found[kind])
+    return None
+
+
+def extract_date_from_text(text):
+    """Find a publish date in the first HEADER_CHARS characters of an article body."""
+    if not text:
+        return None
+    return _best_date(DATE_SCANNER.finditer(text[:HEADER_CHARS]))
+
+
+def extract_date_from_url(url):
+    """Find a /YYYY/MM/DD/ or YYYY-MM-DD style date in a URL."""
+    if not url:
+        return None
+    for match in URL_DATE.finditer(url):
+        parsed = _safe_date(*match.groups())
+        if parsed:
+            return str(parsed)
+    return None
+
+
+def normalize_date(value):
+    """Reduce a stored publish date ('2024-05-01 00:00:00+00:00', 'May 1, 2024', ...) to YYYY-MM-DD."""
+    if not value:
+        return None
+    value = str(value)
+    match = ISO_PREFIX.match(value)
+    if match:
+        parsed = _safe_date(*match.groups())
+        return str(parsed) if parsed else None
+    return extract_date_from_text(value)
+
+
+MEMO_SIZE = 20000
+_memo = {}
+
+
+def _memo_key(article):
+    # `today` is part of the key so relative dates ("2 days ago") expire at midnight
+    header = (article.get("text") or "")[:HEADER_CHARS]
+    return (article.get("url") or "", article.get("publish_date"), header, date.today())
+
+
+def _remember(key, value):
+    if len(_memo) >= MEMO_SIZE:
+        _memo.clear()
+    _memo[key] = value
+    return value
+
+
+def clear_memo():
+    _memo.clear()
+
+
+def _infer(key):
+    url, publish_date, header, _ = key
+    return _remember(key, normalize_date(publish_date)
+                     or (_best_date(DATE_SCANNER.finditer(header)) if header else None)
+                     or extract_date_from_url(url))
+
+
+def infer_publish_date(article):
+    """
+    Best publish date for an article dict (or NewsArticle): stored date, then header text, then URL.
+    Results are memoized per (url, publish_date, header) so rescoring the same corpus is free.
+    """
+    if not isinstance(article, dict):
+        article = article.to_dict()
+    key = _memo_key(article)
+    if key in _memo:
+        return _memo[key]
+    return _infer(key)
+
+
+def extract_dates(articles):
+    """
+    Batch form of infer_publish_date, returning one date (or None) per article.
+    Memo hits are answered first and duplicate articles (syndicated copies, reruns)
+    are scanned only once.
+    """
+    keys = [_memo_key(a if isinstance(a, dict) else a.to_dict()) for a in articles]
+    resolved = {}
+    for key in keys:
+        if key not in resolved:
+            resolved[key] = _memo[key] if key in _memo else _infer(key)
+    return [resolved[key] for key in keys]
@@ -0,0 +1,262 @@
+# modules/module1e_text_analysis.py
+
+import json
+import logging
+import os
+import re
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+
+from modules.module0_model_registry import (blank_spacy, get_resource, package_version, peek_resource,
+                                            porter_stemmer, spacy_model)
+from modules.module1f_analysis_cache import get_analysis_cache, text_key
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Bump whenever analyze_text() output changes so cached analyses are recomputed
+ANALYSIS_VERSION = 4
+
+TOKEN_PATTERN = re.compile(r"\w+|%+")
+NUMBER_PATTERN = re.compile(r"\d+%?")
+# Sentence boundaries of the fact-pair diff tool, which (unlike claim matching) also splits on ! and ?
+FACT_SENTENCE_BREAK = re.compile(r"(?<=[.!?]) +")
+ENTITY_LABELS = {"PERSON", "ORG", "GPE", "LOC", "EVENT", "LAW"}
+
+NER_MODEL = os.getenv("ECHOLENS_NER_MODEL", "en_core_web_sm")
+# Only the NER component runs; everything else in the pipeline is skipped at load time
+NER_EXCLUDE = ["parser", "lemmatizer", "tagger", "attribute_ruler", "senter"]
+NER_BATCH_SIZE = 32
+NER_PROCESSES = int(os.getenv("ECHOLENS_NER_PROCESSES", 1))
+# Extra processes only pay for their start-up cost on larger batches
+NER_MIN_TEXTS_PER_PROCESS = 25
+# Very long pages are cut into chunks for NER, and only the first MAX_NER_CHARS are read at all
+NER_CHUNK_CHARS = 20000
+MAX_NER_CHARS = 200000
+NER_KEY = ("ner", NER_MODEL, tuple(NER_EXCLUDE))
+
+
+@lru_cache(maxsize=50000)
+def stem(word):
+    # NLTK is only imported once something actually needs stemming
+    return porter_stemmer().stem(word)
+
+
+def _pipeline_name(meta):
+    return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}"
+
+
+def ner_model_name():
+    """
+    NER model and version (e.g. 'en_core_web_sm-3.7.1'). Once the model is loaded this is the
+    name get_ner() reports; before that it is read from the installed package or, when
+    ECHOLENS_NER_MODEL is a path, from the pipeline's meta.json, without loading anything.
+    """
+    loaded = peek_resource(NER_KEY)
+    if loaded is not None:
+        return loaded[1]
+    meta_path = os.path.join(NER_MODEL, "meta.json")
+    if os.path.isfile(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            return _pipeline_name(json.load(f))
+    version = package_version(NER_MODEL)
+    return f"{NER_MODEL}-{version}" if version else "blank"
+
+
+def _load_ner():
+    try:
+        nlp = spacy_model(NER_MODEL, NER_EXCLUDE)
+    except OSError:
+        logging.warning(f"spaCy model {NER_MODEL} is not installed; entity scores will be 0. "
+                        f"Install it with: python -m spacy download {NER_MODEL}")
+        return blank_spacy("en"), "blank"
+    return nlp, _pipeline_name(nlp.meta)
+
+
+def get_ner():
+    """(nlp, model name) for entity extraction, loaded once; falls back to a blank pipeline without NER."""
+    return get_resource(NER_KEY, _load_ner)
+
+
+def ner_chunks(text, size=NER_CHUNK_CHARS, limit=MAX_NER_CHARS):
+    """Split text into pieces of at most `size` characters, preferring paragraph then sentence breaks."""
+    text = (text or "")[:limit]
+    chunks = []
+    while len(text) > size:
+        cut = text.rfind("\n", 0, size)
+        if cut <= 0:
+            cut = text.rfind(". ", 0, size) + 1
+        if cut <= 0:
+            cut = size
+        chunks.append(text[:cut])
+        text = text[cut:]
+    if text.strip():
+        chunks.append(text)
+    return chunks
+
+
+def extract_entities_batch(texts, batch_size=NER_BATCH_SIZE, n_process=None):
+    """Entity lists for many texts through a single nlp.pipe() pass, in input order."""
+    nlp, _ = get_ner()
+    owners = []
+    chunks = []
+    for owner, text in enumerate(texts):
+        for chunk in ner_chunks(text):
+            owners.append(owner)
+            chunks.append(chunk)
+
+    if n_process is None:
+        n_process = NER_PROCESSES
+    n_process = max(1, min(n_process, len(chunks) // NER_MIN_TEXTS_PER_PROCESS))
+    if threading.current_thread() is not threading.main_thread():
+        # spaCy starts its workers with the platform default (fork on Linux); forking from a
+        # job or Streamlit thread would copy a multithreaded process, so those stay in-process
+        n_process = 1
+
+    entities = [[] for _ in texts]
+    for owner, doc in zip(owners, nlp.pipe(chunks, batch_size=batch_size, n_process=n_process)):
+        entities[owner].extend(ent.text for ent in doc.ents if ent.label_ in ENTITY_LABELS)
+    return entities
+
+
+def extract_entities(text):
+    """Named entities (people, places, organisations, ...) in text."""
+    return extract_entities_batch([text])[0]
+
+
+def sentence_spans(text):
+    """[start, end] offsets of the stripped ". "-separated sentences that claim matching uses."""
+    spans = []
+    start = 0
+    for piece in text.split(". "):
+        stripped = piece.strip()
+        lead = len(piece) - len(piece.lstrip())
+        spans.append([start + lead, start + lead + len(stripped)])
+        start += len(piece) + 2
+    return spans
+
+
+def fact_sentence_spans(text):
+    """[start, end] offsets of the stripped sentences the fact-pair diff tool compares."""
+    spans = []
+    start = 0
+    for boundary in FACT_SENTENCE_BREAK.finditer(text):
+        spans.append(_stripped_span(text, start, boundary.start()))
+        start = boundary.end()
+    spans.append(_stripped_span(text, start, len(text)))
+    return spans
+
+
+def _stripped_span(text, start, end):
+    piece = text[start:end]
+    lead = len(piece) - len(piece.lstrip())
+    return [start + lead, start + len(piece.rstrip())] if piece.strip() else [start, start]
+
+
+def analyze_text(text):
+    """
+    Everything downstream stages need from an article body, computed in one pass:
+    sentence offsets into `text` (as claim matching and as the diff tool split it),
+    lowercased word/percent tokens with their offsets into `text`, Porter stems and the
+    indexes of numeric tokens. Named entities are left as None here and filled in batches
+    by ensure_entities(). Lowercased text is never stored; it is sliced on demand.
+    """
+    text = text or ""
+    tokens = []
+    token_starts = []
+    for match in TOKEN_PATTERN.finditer(text):
+        tokens.append(match.group().lower())
+        token_starts.append(match.start())
+
+    return {
+        "version": ANALYSIS_VERSION,
+        "text_key": text_key(text),
+        "text_length": len(text),
+        "sentences": sentence_spans(text),
+        "fact_sentences": fact_sentence_spans(text),
+        "tokens": tokens,
+        "token_starts": token_starts,
+        "stems": [stem(token) for token in tokens],
+        "numbers": [i for i, token in enumerate(tokens) if NUMBER_PATTERN.match(token)],
+        "entities": None,
+        "ner_model": None,
+    }
+
+
+def cached_analysis(text):
+    """analyze_text() through the shared analysis cache, so unchanged text is never re-analyzed."""
+    cache = get_analysis_cache()
+    analysis = cache.get(text, ANALYSIS_VERSION)
+    if analysis is None:
+        analysis = analyze_text(text)
+        cache.put(text, ANALYSIS_VERSION, analysis)
+    return analysis
+
+
+def is_current(analysis, text):
+    """True if `analysis` was produced by this ANALYSIS_VERSION from exactly this text (by content hash)."""
+    return (isinstance(analysis, dict) and analysis.get("version") == ANALYSIS_VERSION
+            and analysis.get("text_length") == len(text or "") and analysis.get("text_key") == text_key(text))
+
+
+def get_analysis(article):
+    """
+    The article's analysis, taken from the analysis cache (or computed) and attached to the
+    article dict only if it was not produced at ingestion or is from an older ANALYSIS_VERSION.
+    """
+    text = article.get("text") or ""
+    analysis = article.get("analysis")
+    if not is_current(analysis, text):
+        analysis = cached_analysis(text)
+        article["analysis"] = analysis
+    return analysis
+
+
+def sentence_texts(analysis, text):
+    """(sentence, lowercased sentence) pairs, sliced from the analysis instead of re-split."""
+    return [(sentence, sentence.lower()) for sentence in (text[s:e] for s, e in analysis["sentences"])]
+
+
+def token_sentences(analysis, key="sentences"):
+    """Index of the sentence (from analysis[key]) each token falls in."""
+    starts = [start for start, _ in analysis[key]]
+    return [bisect_right(starts, offset) - 1 for offset in analysis["token_starts"]]
+
+
+def ensure_entities(articles, n_process=None):
+    """
+    Fill in analysis entities for every article that lacks them (or got them from another
+    NER model). Entities already in the analysis cache are reused; the rest go through one
+    batched nlp.pipe() call and are written back to the cache. The model is only loaded
+    when something actually needs NER.
+    """
+    model = ner_model_name()
+    cache = get_analysis_cache()
+    pending = {}
+    for article in articles:
+        analysis = get_analysis(article)
+        if analysis["entities"] is not None and analysis["ner_model"] == model:
+            continue
+        text = article.get("text") or ""
+        cached = cache.get(text, ANALYSIS_VERSION)
+        if cached is not None and cached["entities"] is not None and cached["ner_model"] == model:
+            analysis["entities"] = cached["entities"]
+            analysis["ner_model"] = model
+        else:
+            # match results share their article's analysis dict; run each one once
+            pending[id(analysis)] = (analysis, text)
+    pending = list(pending.values())
+
+    if pending:
+        found = extract_entities_batch([text for _, text in pending], n_process=n_process)
+        model = ner_model_name()
+        for (analysis, text), entities in zip(pending, found):
+            analysis["entities"] = entities
+            analysis["ner_model"] = model
+            cache.put(text, ANALYSIS_VERSION, analysis)
+    return [get_analysis(article)["entities"] for article in articles]
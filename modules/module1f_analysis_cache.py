@@ -0,0 +1,127 @@
+# modules/module1f_analysis_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from modules.module1c_article_cache import CACHE_DIR
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+DEFAULT_MEMORY_ENTRIES = 2000
+DEFAULT_MAX_ENTRIES = int(os.getenv("ECHOLENS_ANALYSIS_CACHE_SIZE", 20000))
+
+
+def text_key(text):
+    """Content hash of an article body; identical text from any URL or run shares one entry."""
+    return hashlib.sha256((text or "").encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of analyze_text() results (tokens, stems, entities, ...) keyed by text hash
+    and analysis version: an in-memory LRU in front of a SQLite table that survives restarts.
+    Entries carry the NER model that filled their entities, so a model change is detected by
+    the caller rather than by the key.
+    """
+
+    def __init__(self, path=None, memory_entries=DEFAULT_MEMORY_ENTRIES, max_entries=DEFAULT_MAX_ENTRIES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "analysis.sqlite3")
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                analysis TEXT NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (key, version)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_accessed ON analyses (accessed_at)")
+        self._conn.commit()
+
+    def _remember(self, memo_key, analysis):
+        self._memory[memo_key] = analysis
+        self._memory.move_to_end(memo_key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, text, version):
+        key = text_key(text)
+        with self._lock:
+            analysis = self._memory.get((key, version))
+            if analysis is not None:
+                self._memory.move_to_end((key, version))
+                return analysis
+            row = self._conn.execute(
+                "SELECT analysis FROM analyses WHERE key = ? AND version = ?", (key, version)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE analyses SET accessed_at = ? WHERE key = ? AND version = ?",
+                               (time.time(), key, version))
+            self._conn.commit()
+            analysis = json.loads(row[0])
+            self._remember((key, version), analysis)
+        return analysis
+
+    def put(self, text, version, analysis):
+        key = text_key(text)
+        with self._lock:
+            self._remember((key, version), analysis)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, version, analysis, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, version, json.dumps(analysis), time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM analyses WHERE rowid IN "
+                "(SELECT rowid FROM analyses ORDER BY accessed_at ASC LIMIT ?)", (overflow,)
+            )
+            logging.info(f"Analysis cache evicted {overflow} entries")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM analyses")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_analysis_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = AnalysisCache()
+        return _default_cache
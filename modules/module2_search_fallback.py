@@ -1,8 +1,11 @@
 # module2_search_fallback.py
 
-from googlesearch import search
 from urllib.parse import urlparse
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from modules.module2b_search_cache import cached_search
+from modules.module2c_domain_index import WatchedDomainIndex
 
 # Logging config
 logging.basicConfig(
@@ -24,33 +27,57 @@ news_domains = [
     "dw.com", "lemonde.fr", "haaretz.com", "timesofisrael.com"
 ]
 
+wire_services = {"reuters.com", "apnews.com"}
+
+# Fallback queries are sent side by side, so a relaxed query costs no extra latency
+_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="echolens-search")
+
+# Allowlist/blocklist files (plain list or CSV with tier/region/wire columns) replace the
+# curated list above when configured, and are reloaded automatically when edited.
+domain_index = WatchedDomainIndex(
+    allow_path=os.getenv("ECHOLENS_DOMAINS_PATH"),
+    block_path=os.getenv("ECHOLENS_BLOCKLIST_PATH"),
+    default_domains=news_domains,
+    wire_domains=wire_services,
+    psl_path=os.getenv("ECHOLENS_PSL_PATH"),
+)
+
 def get_domain(url):
     netloc = urlparse(url).netloc.lower()
     if netloc.startswith("www."):
         netloc = netloc[4:]
     return netloc
 
+def filter_news_urls(urls, results, seen_domains):
+    """Append approved, not-yet-seen-outlet URLs to `results` (in place)."""
+    index = domain_index.current()
+    for url in urls:
+        print(f"Found: {url}")
+
+        info = index.match(url)
+        if info is None or info.blocked:
+            print(f"✗ Filtered (not in approved list): {get_domain(url)}")
+            continue
+
+        # dedupe per listed outlet so edition.cnn.com and cnn.com count once
+        domain = info.domain
+
+        if domain in seen_domains:
+            print(f"✗ Skipped duplicate domain: {domain}")
+            continue
+
+        print(f"✓ Accepted [{domain}]: {url}")
+        results.append(url)
+        seen_domains.add(domain)
+    return results
+
 def search_related_articles(query, num_results=20):
     print(f"\n🔍 Searching for related articles on: \"{query}\"")
     results = []
     seen_domains = set()
 
     try:
-        for url in search(query, num_results=num_results):
-            domain = get_domain(url)
-            print(f"Found: {url}")
-
-            if not any(known in domain for known in news_domains):
-                print(f"✗ Filtered (not in approved list): {domain}")
-                continue
-
-            if domain in seen_domains:
-                print(f"✗ Skipped duplicate domain: {domain}")
-                continue
-
-            print(f"✓ Accepted [{domain}]: {url}")
-            results.append(url)
-            seen_domains.add(domain)
+        filter_news_urls(cached_search(query, num_results), results, seen_domains)
 
     except Exception as e:
         logging.error(f"Search failed: {e}")
@@ -59,3 +86,29 @@ def search_related_articles(query, num_results=20):
     print(f"\n✅ Total accepted, unique-domain results: {len(results)}")
     return results
 
+def search_related_multi(queries, num_results=20, min_domains=5):
+    """
+    Run fallback queries (e.g. the title, then a relaxed version) concurrently and merge their
+    accepted URLs in query order. Once the queries merged so far have found `min_domains`
+    unique domains, the remaining ones are cancelled if they have not started, and their
+    results are ignored if they have. Every query goes through the shared search cache, and
+    identical queries in flight in other sessions are coalesced.
+    """
+    queries = [q for q in dict.fromkeys(queries) if q and q.strip()]
+    print(f"\n🔍 Searching for related articles on up to {len(queries)} queries: {queries}")
+    futures = [_search_executor.submit(cached_search, query, num_results) for query in queries]
+    results = []
+    seen_domains = set()
+    for query, future in zip(queries, futures):
+        if len(results) >= min_domains:
+            future.cancel()
+            print(f"⏹️ Found {len(results)} unique domains, ignoring query \"{query}\"")
+            continue
+        try:
+            filter_news_urls(future.result(), results, seen_domains)
+        except Exception as e:
+            logging.error(f"Search failed for \"{query}\": {e}")
+            print("[ERROR] Search failed. See echolens.log for details.")
+
+    print(f"\n✅ Total accepted, unique-domain results: {len(results)}")
+    return results
@@ -0,0 +1,124 @@
+# modules/module2b_search_cache.py
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from googlesearch import search
+
+from modules.module1c_article_cache import CACHE_DIR
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+DEFAULT_TTL = int(os.getenv("ECHOLENS_SEARCH_TTL", 60 * 60))
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive cache key for a search query."""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+class SearchCache:
+    """On-disk cache of ranked search results: (normalized query, num_results) → URL list."""
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "searches.sqlite3")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT NOT NULL,
+                num_results INTEGER NOT NULL,
+                urls TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (query, num_results)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, query, num_results):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT urls, fetched_at FROM searches WHERE query = ? AND num_results = ?",
+                (normalize_query(query), num_results)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, query, num_results, urls):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (query, num_results, urls, fetched_at) VALUES (?, ?, ?, ?)",
+                (normalize_query(query), num_results, json.dumps(urls), time.time())
+            )
+            self._conn.execute("DELETE FROM searches WHERE fetched_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+
+
+_default_cache = None
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def get_search_cache():
+    global _default_cache
+    with _inflight_lock:
+        if _default_cache is None:
+            _default_cache = SearchCache()
+        return _default_cache
+
+
+def cached_search(query, num_results=20):
+    """
+    Ranked result URLs for a query, served from cache when possible.
+    Identical queries already in flight (e.g. from another Streamlit session) are
+    coalesced: only the first caller hits Google, the rest wait for its result.
+    Empty result lists are not cached, since that is what Google returns when it throttles.
+    """
+    cache = get_search_cache()
+    urls = cache.get(query, num_results)
+    if urls is not None:
+        logging.info(f"Search cache hit: {query}")
+        return urls
+
+    key = (normalize_query(query), num_results)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+
+    if not leader:
+        logging.info(f"Joining in-flight search: {query}")
+        return future.result()
+
+    try:
+        urls = list(search(query, num_results=num_results))
+        if urls:
+            cache.put(query, num_results, urls)
+        else:
+            logging.warning(f"Search returned no results (possibly rate-limited), not cached: {query}")
+        future.set_result(urls)
+        return urls
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
@@ -0,0 +1,216 @@
+# modules/module2c_domain_index.py
+
+import csv
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlparse
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+DomainInfo = namedtuple("DomainInfo", ["domain", "tier", "region", "wire", "blocked"])
+
+# Multi-label public suffixes that matter for the outlets we track. Point ECHOLENS_PSL_PATH at a
+# copy of https://publicsuffix.org/list/public_suffix_list.dat for complete coverage.
+BUILTIN_PUBLIC_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "ltd.uk", "plc.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp",
+    "co.nz", "org.nz", "co.za", "co.in", "co.il", "org.il", "co.kr",
+    "com.br", "com.cn", "com.hk", "com.mx", "com.sg", "com.tr", "com.ar", "com.ng", "com.pk",
+}
+
+RELOAD_INTERVAL = 30
+
+TRUE_VALUES = {"1", "true", "yes", "y", "wire"}
+
+
+def get_host(url):
+    """Lowercase host of a URL (or of a bare hostname), without port or trailing dot."""
+    netloc = urlparse(url).netloc if "//" in url else url
+    return netloc.rsplit("@", 1)[-1].split(":", 1)[0].strip(".").lower()
+
+
+def host_suffixes(host):
+    """'edition.cnn.com' → ['com', 'cnn.com', 'edition.cnn.com']; one entry per label."""
+    suffixes = []
+    end = len(host)
+    while True:
+        dot = host.rfind(".", 0, end)
+        suffixes.append(host[dot + 1:])
+        if dot == -1:
+            return suffixes
+        end = dot
+
+
+class PublicSuffixList:
+    """Public-suffix rules (plain, wildcard and exception) answered with one set lookup per label."""
+
+    def __init__(self, rules=BUILTIN_PUBLIC_SUFFIXES):
+        self.rules = set()
+        self.wildcards = set()
+        self.exceptions = set()
+        for rule in rules:
+            rule = rule.strip().lower()
+            if not rule or rule.startswith("//"):
+                continue
+            rule = rule.split()[0]
+            if rule.startswith("!"):
+                self.exceptions.add(rule[1:])
+            elif rule.startswith("*."):
+                self.wildcards.add(rule[2:])
+            else:
+                self.rules.add(rule)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f)
+
+    def suffix_labels(self, suffixes):
+        """Number of labels in the public suffix, given host_suffixes() output."""
+        labels = 1  # implicit "*" rule: the TLD is always a public suffix
+        for count, suffix in enumerate(suffixes, start=1):
+            if suffix in self.exceptions:
+                return count - 1
+            parent = suffixes[count - 2] if count > 1 else None
+            if suffix in self.rules or (parent is not None and parent in self.wildcards):
+                labels = count
+        return labels
+
+    def registrable_domain(self, host):
+        """eTLD+1 of a host ('edition.cnn.com' → 'cnn.com', 'www.bbc.co.uk' → 'bbc.co.uk')."""
+        suffixes = host_suffixes(host)
+        labels = self.suffix_labels(suffixes)
+        if labels >= len(suffixes):
+            return None  # the host is itself a public suffix
+        return suffixes[labels]
+
+    def is_public_suffix(self, host):
+        return self.registrable_domain(host) is None
+
+
+class DomainIndex:
+    """
+    Allow/block list keyed by domain. A URL matches an entry when its host equals the entry
+    or is a subdomain of it, checked label by label, so 'notcnn.com' never matches 'cnn.com'.
+    The most specific entry wins, which lets a blocklist carve a section out of an allowed outlet.
+    """
+
+    def __init__(self, public_suffixes=None):
+        self.psl = public_suffixes or PublicSuffixList()
+        self._entries = {}
+
+    def add(self, domain, tier=None, region=None, wire=False, blocked=False):
+        domain = get_host(domain)
+        if domain.startswith("www."):
+            domain = domain[4:]
+        if not domain or self.psl.is_public_suffix(domain):
+            logging.warning(f"Ignoring domain list entry that is a public suffix: {domain!r}")
+            return
+        self._entries[domain] = DomainInfo(domain, tier, region, bool(wire), bool(blocked))
+
+    def lookup_host(self, host):
+        best = None
+        for suffix in host_suffixes(host):
+            info = self._entries.get(suffix)
+            if info is not None:
+                best = info
+        return best
+
+    def match(self, url):
+        """DomainInfo of the most specific entry covering the URL's host, or None."""
+        return self.lookup_host(get_host(url))
+
+    def is_allowed(self, url):
+        info = self.match(url)
+        return info is not None and not info.blocked
+
+    def registrable_domain(self, url):
+        host = get_host(url)
+        return self.psl.registrable_domain(host) or host
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load_file(self, path, blocked=False):
+        """
+        Load a plain list (one domain per line, '#' comments) or a CSV with a header of
+        domain[,tier,region,wire,list] where list is 'allow' or 'block'.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if path.lower().endswith(".csv"):
+                for row in csv.DictReader(f):
+                    row = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+                    self.add(
+                        row.get("domain", ""),
+                        tier=row.get("tier") or None,
+                        region=row.get("region") or None,
+                        wire=row.get("wire", "").lower() in TRUE_VALUES,
+                        blocked=blocked or row.get("list", "").lower() == "block",
+                    )
+            else:
+                for line in f:
+                    line = line.split("#", 1)[0].strip()
+                    if line:
+                        self.add(line, blocked=blocked)
+        return self
+
+    @classmethod
+    def from_domains(cls, domains, wire_domains=(), public_suffixes=None):
+        index = cls(public_suffixes)
+        for domain in domains:
+            index.add(domain, wire=domain in wire_domains)
+        return index
+
+
+class WatchedDomainIndex:
+    """
+    DomainIndex built from allow/block list files and rebuilt when they change on disk.
+    Readers always get a complete index: a reload builds a new one and swaps the reference.
+    """
+
+    def __init__(self, allow_path=None, block_path=None, default_domains=(), wire_domains=(),
+                 psl_path=None, check_interval=RELOAD_INTERVAL):
+        self.allow_path = allow_path
+        self.block_path = block_path
+        self.default_domains = list(default_domains)
+        self.wire_domains = set(wire_domains)
+        self.psl = PublicSuffixList.from_file(psl_path) if psl_path else PublicSuffixList()
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtimes = None
+        self._checked_at = 0
+        self._index = self._build()
+
+    def _current_mtimes(self):
+        return tuple(os.path.getmtime(p) if p and os.path.exists(p) else None
+                     for p in (self.allow_path, self.block_path))
+
+    def _build(self):
+        self._mtimes = self._current_mtimes()
+        if self.allow_path and os.path.exists(self.allow_path):
+            index = DomainIndex(self.psl).load_file(self.allow_path)
+        else:
+            index = DomainIndex.from_domains(self.default_domains, self.wire_domains, self.psl)
+        if self.block_path and os.path.exists(self.block_path):
+            index.load_file(self.block_path, blocked=True)
+        logging.info(f"Domain index loaded with {len(index)} entries")
+        return index
+
+    def current(self):
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            with self._lock:
+                if now - self._checked_at >= self.check_interval:
+                    self._checked_at = now
+                    if self._current_mtimes() != self._mtimes:
+                        self._index = self._build()
+        return self._index
@@ -1,14 +1,38 @@
-import json
-from modules.module1_article_ingestion import NewsArticle
+import logging
+from modules.module3b_fetch_pool import (
+    fetch_articles, DEFAULT_WORKERS, DEFAULT_PER_DOMAIN, PARSE_WORKERS,
+    CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RESPONSE_BYTES
+)
+from modules.module3c_near_duplicates import collapse_near_duplicates
+from modules.module4b_sentence_index import get_sentence_index
+from modules.module9_article_store import get_article_store
+
+def extract_related_articles(url_list, workers=DEFAULT_WORKERS, per_domain=DEFAULT_PER_DOMAIN,
+                             connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                             max_bytes=MAX_RESPONSE_BYTES, parse_workers=PARSE_WORKERS, errors=None, session=None):
+    """
+    Fetch and parse related articles concurrently, preserving input order.
+    `parse_workers` > 0 (default: ECHOLENS_PARSE_WORKERS) moves html parsing into a process pool.
+    Failed URLs are logged and, if an `errors` list is passed, appended to it as {url, error} records.
+    Syndicated copies are collapsed into their first copy (listed in its 'mirrors'), and the
+    canonical articles are saved to the article store under `session` (a new one if not given)
+    and indexed for claim comparison.
+    """
+    records = fetch_articles(url_list, workers, per_domain, connect_timeout, read_timeout,
+                             max_bytes, parse_workers)
 
-def extract_related_articles(url_list):
     extracted = []
-    for url in url_list:
-        try:
-            article = NewsArticle(url).extract()
-            extracted.append(article.to_dict())
-        except:
-            pass
-    with open("related_articles.json", "w", encoding="utf-8") as f:
-        json.dump(extracted, f, indent=4)
+    for record in records:
+        if record["error"]:
+            print(f"⚠️ Failed to extract {record['url']}: {record['error']}")
+            if errors is not None:
+                errors.append({"url": record["url"], "error": record["error"]})
+            continue
+        extracted.append(record["article"])
+
+    logging.info(f"Extracted {len(extracted)}/{len(records)} related articles")
+    extracted = collapse_near_duplicates(extracted)
+
+    get_article_store().save(extracted, "related", session)
+    get_sentence_index(extracted)
     return extracted
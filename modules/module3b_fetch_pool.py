@@ -0,0 +1,172 @@
+# modules/module3b_fetch_pool.py
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import requests
+
+from modules.module1_article_ingestion import NewsArticle, parse_html
+from modules.module1c_article_cache import get_article_cache
+from modules.module1b_page_fetch import CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RESPONSE_BYTES, ResponseTooLarge
+from modules.module2_search_fallback import get_domain
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+DEFAULT_WORKERS = 8
+DEFAULT_PER_DOMAIN = 2
+# Processes that parse downloaded html (0 parses in the fetch threads)
+PARSE_WORKERS = int(os.getenv("ECHOLENS_PARSE_WORKERS", 0))
+
+
+class FetchPool:
+    """
+    Thread pool that fetches articles with a per-domain concurrency cap.
+    With `parse_workers` > 0 the downloaded html is parsed in a process pool,
+    so CPU-bound lxml/newspaper work is not serialized behind the GIL. The pool is
+    spawned, not forked, before any fetch thread starts: a forked child would inherit
+    the parent's threads' locks and its open SQLite cache connections.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, per_domain=DEFAULT_PER_DOMAIN,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_bytes=MAX_RESPONSE_BYTES, parse_workers=PARSE_WORKERS, use_cache=True):
+        self.workers = max(1, workers)
+        self.per_domain = max(1, per_domain)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_bytes = max_bytes
+        self.parse_workers = parse_workers
+        self.cache = get_article_cache() if use_cache else None
+        self._parse_executor = None
+        self._domain_slots = defaultdict(lambda: threading.BoundedSemaphore(self.per_domain))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _slot(self, url):
+        with self._lock:
+            return self._domain_slots[get_domain(url)]
+
+    def fetch_one(self, url):
+        """
+        Fetch and parse a single URL, returning a record instead of raising. Every failure is
+        logged, whether or not the caller collects the error records: download failures by
+        fetch_page, everything else here.
+        """
+        record = {"url": url, "article": None, "error": None}
+        try:
+            with self._slot(url):
+                payload, page = NewsArticle(url).download(
+                    self.cache,
+                    connect_timeout=self.connect_timeout,
+                    read_timeout=self.read_timeout,
+                    max_bytes=self.max_bytes,
+                    session=self._session()
+                )
+        except (requests.RequestException, ResponseTooLarge) as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            return record
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            logging.warning(f"Fetch failed for {url}: {record['error']}")
+            return record
+        try:
+            if payload is None:
+                payload = self._parse(url, page.html)
+                if self.cache is not None:
+                    self.cache.put(url, payload, page.etag, page.last_modified)
+            record["article"] = payload
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            logging.warning(f"Parse failed for {url}: {record['error']}")
+        return record
+
+    def _parse(self, url, html):
+        if self._parse_executor is not None:
+            return self._parse_executor.submit(parse_html, url, html).result()
+        return parse_html(url, html)
+
+    def _start(self):
+        if self.parse_workers and self._parse_executor is None:
+            self._parse_executor = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                                       mp_context=multiprocessing.get_context("spawn"))
+
+    def _stop(self):
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(cancel_futures=True)
+            self._parse_executor = None
+
+    def map(self, url_list):
+        """Fetch every URL concurrently; records come back in input order."""
+        url_list = list(url_list)
+        if not url_list:
+            return []
+        self._start()
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(url_list))) as executor:
+                return list(executor.map(self.fetch_one, url_list))
+        finally:
+            self._stop()
+
+    def iter_completed(self, url_list):
+        """Yield records as soon as each URL finishes, fastest site first."""
+        url_list = list(url_list)
+        if not url_list:
+            return
+        self._start()
+        executor = ThreadPoolExecutor(max_workers=min(self.workers, len(url_list)))
+        try:
+            futures = [executor.submit(self.fetch_one, url) for url in url_list]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # a consumer that stops early should not wait for the remaining sites
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._stop()
+
+
+def fetch_articles(url_list, workers=DEFAULT_WORKERS, per_domain=DEFAULT_PER_DOMAIN,
+                   connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                   max_bytes=MAX_RESPONSE_BYTES, parse_workers=PARSE_WORKERS):
+    """Return one {url, article, error} record per URL, in input order."""
+    pool = FetchPool(workers, per_domain, connect_timeout, read_timeout, max_bytes, parse_workers)
+    return pool.map(url_list)
+
+
+def _parse_record(page):
+    url, html = page
+    try:
+        return {"url": url, "article": parse_html(url, html), "error": None}
+    except Exception as e:
+        return {"url": url, "article": None, "error": f"{type(e).__name__}: {e}"}
+
+
+def ingest_html(pages, processes=None, chunksize=4):
+    """
+    Parse already-downloaded (url, html) pairs across all cores, e.g. an archive of saved pages.
+    Returns one {url, article, error} record per page, in input order.
+    """
+    pages = list(pages)
+    if not pages:
+        return []
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+        records = list(executor.map(_parse_record, pages, chunksize=chunksize))
+    for record in records:
+        if record["error"]:
+            logging.warning(f"Parse failed for {record['url']}: {record['error']}")
+    return records
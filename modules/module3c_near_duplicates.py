@@ -0,0 +1,125 @@
+# modules/module3c_near_duplicates.py
+
+import hashlib
+import logging
+from collections import defaultdict
+
+import numpy as np
+
+from modules.module1e_text_analysis import get_analysis
+from modules.module2c_domain_index import get_host
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+SIMHASH_BITS = 64
+# 4 bands of 16 bits: two fingerprints within MAX_DISTANCE (< 4) bits agree on at least one band
+BANDS = 4
+MAX_DISTANCE = 3
+SHINGLE_WORDS = 3
+# Bodies shorter than this are teasers or paywalls; their fingerprints are too noisy to trust
+MIN_TOKENS = 50
+
+_BIT_WEIGHTS = np.uint64(1) << np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def simhash(tokens, shingle=SHINGLE_WORDS):
+    """64-bit SimHash over word shingles, or None if there are too few tokens."""
+    if len(tokens) < max(MIN_TOKENS, shingle):
+        return None
+    shingles = {" ".join(tokens[i:i + shingle]) for i in range(len(tokens) - shingle + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+    bits = (hashes[:, None] & _BIT_WEIGHTS) != 0
+    votes = bits.sum(axis=0) * 2 > len(hashes)
+    return int(_BIT_WEIGHTS[votes].sum())
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def article_fingerprint(article):
+    """SimHash of the article body, from its token analysis (None for short or empty bodies)."""
+    if not article.get("text"):
+        return None
+    return simhash(get_analysis(article)["tokens"])
+
+
+def mirror_entry(article):
+    """What the report needs to list a collapsed copy: where it ran, under which title, and when."""
+    host = get_host(article.get("url") or "")
+    return {
+        "url": article.get("url"),
+        "domain": host[4:] if host.startswith("www.") else host,
+        "title": article.get("title"),
+        "publish_date": article.get("publish_date"),
+    }
+
+
+class NearDuplicateIndex:
+    """
+    Banded SimHash index. Each fingerprint is filed under its BANDS 16-bit slices, so a lookup
+    only computes Hamming distances against fingerprints sharing a slice instead of the whole corpus.
+    """
+
+    def __init__(self, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.band_bits = SIMHASH_BITS // BANDS
+        self._bands = defaultdict(list)
+
+    def _keys(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(band, (fingerprint >> (band * self.band_bits)) & mask) for band in range(BANDS)]
+
+    def find(self, fingerprint):
+        """The closest stored item within max_distance bits, or None."""
+        best, best_distance = None, self.max_distance + 1
+        for key in self._keys(fingerprint):
+            for stored, item in self._bands.get(key, ()):
+                distance = hamming(fingerprint, stored)
+                if distance < best_distance:
+                    best, best_distance = item, distance
+        return best
+
+    def add(self, fingerprint, item):
+        for key in self._keys(fingerprint):
+            self._bands[key].append((fingerprint, item))
+
+
+def iter_unique_articles(articles, max_distance=MAX_DISTANCE):
+    """
+    Yield only the first copy of each syndicated story, so input order decides which outlet is
+    canonical. Later near-duplicates (SimHash within `max_distance` bits) are not yielded; they
+    are appended to the canonical article's 'mirrors' list instead, so every outlet is still
+    reported once the stream is consumed. Yielded articles are copies; the input is not modified.
+    """
+    index = NearDuplicateIndex(max_distance)
+    collapsed = 0
+    for article in articles:
+        mirrors = list(article.get("mirrors") or [])
+        article = article.copy()
+        article["mirrors"] = mirrors
+        fingerprint = article_fingerprint(article)
+        if fingerprint is not None:
+            canonical = index.find(fingerprint)
+            if canonical is not None:
+                canonical["mirrors"].append(mirror_entry(article))
+                canonical["mirrors"].extend(article["mirrors"])
+                collapsed += 1
+                continue
+            index.add(fingerprint, article)
+        yield article
+    if collapsed:
+        logging.info(f"Collapsed {collapsed} syndicated copies into their canonical articles")
+
+
+def collapse_near_duplicates(articles, max_distance=MAX_DISTANCE):
+    """Canonical articles in input order, each with a 'mirrors' list of the copies it stands for."""
+    return list(iter_unique_articles(articles, max_distance))
@@ -1,78 +1,109 @@
 # modules/module4_claim_comparator.py
 
-from rapidfuzz import fuzz
+import threading
+import weakref
+from collections import OrderedDict
 
-def compare_claim_across_articles(claim_input, related_articles, threshold=60, exact_match=False):
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from modules.module4b_sentence_index import SentenceIndex, get_sentence_index
+from modules.module4c_boolean_query import QuerySyntaxError, is_boolean_query, parse_query, query_terms
+from modules.module4d_tfidf_index import DEFAULT_TOP_K, get_tfidf_index
+
+# Sentences between this score and the threshold are reported as ignored partial matches
+PARTIAL_REPORT_SCORE = 50
+
+# Sentence of the marker match given to articles that satisfy a query without a positive phrase
+QUERY_MATCH_SENTENCE = "(matches the query: none of the excluded phrases found)"
+
+# "fuzzy": character-level partial_ratio; "tfidf": word-level cosine similarity (paraphrases)
+MATCH_MODES = ("fuzzy", "tfidf")
+
+# Scores are cached down to this floor, so any threshold at or above it re-selects from the cache
+SCORE_FLOORS = {"fuzzy": PARTIAL_REPORT_SCORE, "tfidf": 1}
+MAX_CACHED_CLAIMS = 32
+
+_score_cache = weakref.WeakKeyDictionary()
+_score_lock = threading.Lock()
+
+def split_claim(claim_input):
+    """Split input claim string into multiple phrases (by comma or semicolon)."""
+    return [phrase.strip() for phrase in claim_input.replace(";", ",").split(",") if phrase.strip()]
+
+def parse_claim(claim_input):
     """
-    Compare a claim or set of key phrases across related articles.
-    Accepts related_articles directly instead of loading from file.
+    Boolean query tree for claims that use AND/OR/NOT as operators; otherwise the list of
+    comma-separated phrases.
     """
+    if is_boolean_query(claim_input):
+        try:
+            return parse_query(claim_input)
+        except QuerySyntaxError as e:
+            print(f"⚠️ Could not parse boolean query ({e}); matching the phrases literally.")
+    return split_claim(claim_input)
 
-    if not related_articles:
-        print("❌ No related articles available for comparison.")
-        return []
+def score_matrix(phrases_lower, sentences_lower, exact_match=False, score_cutoff=0, workers=-1):
+    """phrase×sentence score matrix for pre-lowercased inputs; scores below `score_cutoff` are 0."""
+    if exact_match:
+        # Exact match logic: only score 100% if exact
+        return np.array([[100.0 if phrase in sentence else 0.0 for sentence in sentences_lower]
+                         for phrase in phrases_lower]).reshape(len(phrases_lower), len(sentences_lower))
+    return process.cdist(phrases_lower, sentences_lower, scorer=fuzz.partial_ratio,
+                         score_cutoff=score_cutoff, dtype=np.float64, workers=workers)
 
-    # Split input claim string into multiple phrases (by comma or semicolon)
-    claim_phrases = [phrase.strip() for phrase in claim_input.replace(";", ",").split(",") if phrase.strip()]
-    print(f"\n📌 Comparing against {len(claim_phrases)} key phrase(s): {claim_phrases}\n")
+def best_per_sentence(matrix):
+    """Best score and best phrase index per sentence column; ties go to the earliest phrase."""
+    best_phrase = matrix.argmax(axis=0)
+    best_score = matrix[best_phrase, np.arange(matrix.shape[1])]
+    return best_score, best_phrase
 
-    results = []
+def score_sentences(claim_phrases, sentences_lower, exact_match=False, score_cutoff=0, workers=-1):
+    """
+    Best score and best phrase index for every (pre-lowercased) sentence, computed as one
+    phrase×sentence matrix. Scores below `score_cutoff` are pruned to 0 inside rapidfuzz.
+    Ties go to the earliest phrase, as in the original per-sentence loop.
+    """
+    if not claim_phrases or not sentences_lower:
+        return np.zeros(len(sentences_lower)), np.zeros(len(sentences_lower), dtype=int)
 
-    for article in related_articles:
-        matches = []
-        text = article.get("text", "")
+    phrases_lower = [phrase.lower() for phrase in claim_phrases]
+    return best_per_sentence(score_matrix(phrases_lower, sentences_lower, exact_match, score_cutoff, workers))
 
-        if not text or len(text.strip()) < 20:
-            print(f"⚠️ No usable text found for article: {article.get('title')}")
-            results.append({
-                "url": article.get("url"),
-                "title": article.get("title"),
-                "publish_date": article.get("publish_date", "Unknown"),
-                "text": text,
-                "matches": []
-            })
-            continue
+def _empty_result(article, text):
+    return {
+        "url": article.get("url"),
+        "title": article.get("title"),
+        "publish_date": article.get("publish_date", "Unknown"),
+        "text": text,
+        "analysis": article.get("analysis"),
+        "mirrors": article.get("mirrors", []),
+        "matches": []
+    }
 
-        sentences = text.split(". ")
+def _collect_matches(article, text, sentences, best_score, best_phrase, claim_phrases, threshold, verbose):
+    matches = []
+    if verbose:
         print(f"🔍 Checking article: {article.get('title')}")
         print(f" - Total sentences: {len(sentences)}")
 
-        for sentence in sentences:
-            sentence = sentence.strip()
-            best_score = 0
-            best_phrase = None
-
-            for phrase in claim_phrases:
-                if exact_match:
-                    # Exact match logic: only score 100% if exact
-                    score = 100 if phrase.lower() in sentence.lower() else 0
-                else:
-                    score = fuzz.partial_ratio(phrase.lower(), sentence.lower())
-
-                if score > best_score:
-                    best_score = score
-                    best_phrase = phrase
-
-            if best_score >= threshold:
-                print(f"✅ Match [{best_score:.2f}%] on \"{best_phrase}\" → {sentence}")
-                matches.append({
-                    "sentence": sentence,
-                    "score": round(best_score, 2),
-                    "phrase": best_phrase
-                })
-            elif best_score > 50:
-                print(f"🟡 Partial match (ignored) [{best_score:.2f}%] on \"{best_phrase}\" → {sentence}")
-
-        result = {
-            "url": article.get("url"),
-            "title": article.get("title"),
-            "publish_date": article.get("publish_date", "Unknown"),
-            "text": text,
-            "matches": matches
-        }
+    for i in np.flatnonzero(best_score > 0).tolist():
+        sentence, score, phrase = sentences[i], float(best_score[i]), claim_phrases[best_phrase[i]]
+        if score >= threshold:
+            if verbose:
+                print(f"✅ Match [{score:.2f}%] on \"{phrase}\" → {sentence}")
+            matches.append({
+                "sentence": sentence,
+                "score": round(score, 2),
+                "phrase": phrase
+            })
+        elif verbose and score > PARTIAL_REPORT_SCORE:
+            print(f"🟡 Partial match (ignored) [{score:.2f}%] on \"{phrase}\" → {sentence}")
 
-        results.append(result)
+    result = _empty_result(article, text)
+    result["matches"] = matches
 
+    if verbose:
         if matches:
             print(f"\n📰 {result['title']}")
             for m in matches:
@@ -80,4 +111,320 @@ def compare_claim_across_articles(claim_input, related_articles, threshold=60, e
         else:
             print(" - No matches found.")
 
+    return result
+
+def _build_results(related_articles, index, best_score, best_phrase, claim_phrases, threshold, verbose):
+    if not verbose:
+        return _build_results_quiet(related_articles, index, best_score, best_phrase, claim_phrases, threshold)
+    results = []
+    for article, (sentences, start, end) in zip(related_articles, index.spans):
+        text = article.get("text", "")
+        if sentences is None:
+            if verbose:
+                print(f"⚠️ No usable text found for article: {article.get('title')}")
+            results.append(_empty_result(article, text))
+            continue
+        results.append(_collect_matches(article, text, sentences, best_score[start:end],
+                                        best_phrase[start:end], claim_phrases, threshold, verbose))
+    return results
+
+def _build_results_quiet(related_articles, index, best_score, best_phrase, claim_phrases, threshold):
+    """Same results as _build_results without printing, touching only the matching sentences."""
+    hits = np.flatnonzero(best_score >= threshold)
+    matches_by_article = {}
+    for sentence_id, article_id in zip(hits.tolist(), index.sentence_articles[hits].tolist()):
+        matches_by_article.setdefault(article_id, []).append(sentence_id)
+
+    results = []
+    for article_id, (article, (sentences, start, _)) in enumerate(zip(related_articles, index.spans)):
+        result = _empty_result(article, article.get("text", ""))
+        for sentence_id in matches_by_article.get(article_id, ()):
+            result["matches"].append({
+                "sentence": sentences[sentence_id - start],
+                "score": round(float(best_score[sentence_id]), 2),
+                "phrase": claim_phrases[best_phrase[sentence_id]]
+            })
+        results.append(result)
+    return results
+
+def corpus_scores(claim_phrases, index, exact_match=False, cutoff=0, workers=-1):
+    """
+    Best score and phrase for every sentence of the index. Only sentences the n-gram index
+    cannot rule out are fuzzy-scored; the rest provably fall below the cutoff and are left at 0.
+    """
+    phrases_lower = [phrase.lower() for phrase in claim_phrases]
+    candidates = index.candidates_for_phrases(phrases_lower, cutoff, exact_match)
+
+    if candidates is None:
+        return score_sentences(claim_phrases, index.sentences_lower, exact_match, cutoff, workers)
+    best_score = np.zeros(len(index))
+    best_phrase = np.zeros(len(index), dtype=int)
+    subset = [index.sentences_lower[i] for i in candidates.tolist()]
+    best_score[candidates], best_phrase[candidates] = score_sentences(
+        claim_phrases, subset, exact_match, cutoff, workers)
+    return best_score, best_phrase
+
+def score_corpus(claim_phrases, related_articles, threshold=60, exact_match=False, verbose=True, workers=-1,
+                 index=None):
+    """Score the corpus in a single batched call and return per-article results in input order."""
+    if index is None:
+        index = get_sentence_index(related_articles)
+
+    # Keep partial scores only when they will be printed; otherwise prune at the threshold
+    cutoff = min(threshold, PARTIAL_REPORT_SCORE) if verbose else threshold
+    best_score, best_phrase = corpus_scores(claim_phrases, index, exact_match, cutoff, workers)
+    return _build_results(related_articles, index, best_score, best_phrase, claim_phrases, threshold, verbose)
+
+def score_tfidf(claim_phrases, related_articles, threshold=30, verbose=True, index=None, top_k=DEFAULT_TOP_K):
+    """
+    Score the corpus by TF-IDF cosine similarity (× 100) instead of partial_ratio,
+    keeping the `top_k` best sentences per phrase.
+    """
+    if index is None:
+        index = get_sentence_index(related_articles)
+
+    phrases_lower = [phrase.lower() for phrase in claim_phrases]
+    best_score, best_phrase = get_tfidf_index(index).score(phrases_lower, threshold, top_k)
+    return _build_results(related_articles, index, best_score, best_phrase, claim_phrases, threshold, verbose)
+
+class _QueryScorer:
+    """
+    Evaluation context for a boolean query over a SentenceIndex. Article sets are bounded
+    with the index first; a phrase is fuzzy-scored only on the candidate sentences of the
+    articles still in play, and each sentence is scored at most once per phrase.
+    With a TF-IDF index, candidates are the sentences sharing a term with the phrase.
+    Queries scored with the same `shared` dict reuse each other's phrase scores; fuzzy
+    scores are kept down to `score_cutoff` (the threshold by default), so a shared dict
+    serves any threshold at or above it.
+    """
+
+    def __init__(self, index, threshold, exact_match, workers, tfidf=None, shared=None, score_cutoff=None):
+        self.index = index
+        self.tfidf = tfidf
+        self.threshold = threshold
+        self.score_cutoff = threshold if score_cutoff is None else score_cutoff
+        self.exact_match = exact_match
+        self.workers = workers
+        self.all_articles = {i for i, span in enumerate(index.spans) if span[0] is not None}
+        self._upper = {}
+        shared = {} if shared is None else shared
+        self._candidates = shared.setdefault("candidates", {})
+        self._scores = shared.setdefault("scores", {})
+
+    def upper(self, node):
+        key = id(node)
+        if key not in self._upper:
+            self._upper[key] = node.upper(self)
+        return self._upper[key]
+
+    def upper_size(self, node):
+        return len(self.upper(node))
+
+    def candidate_sentences(self, term):
+        key = (term.lower, self.threshold)
+        if key not in self._candidates:
+            if self.tfidf is not None:
+                ids = self.tfidf.candidate_ids(term.lower) if self.threshold > 0 else None
+            else:
+                ids = self.index.candidate_ids(term.lower, self.threshold, self.exact_match)
+            self._candidates[key] = np.arange(len(self.index)) if ids is None else ids
+        return self._candidates[key]
+
+    def candidate_articles(self, term):
+        ids = self.candidate_sentences(term)
+        return set(np.unique(self.index.sentence_articles[ids]).tolist())
+
+    def term_scores(self, term, articles):
+        """Scores of the term's candidate sentences within `articles`, scoring any not seen yet."""
+        ids = self.candidate_sentences(term)
+        ids = ids[np.isin(self.index.sentence_articles[ids], list(articles))]
+        scores = self._scores.setdefault(term.lower, np.full(len(self.index), np.nan))
+        todo = ids[np.isnan(scores[ids])]
+        if todo.size and self.tfidf is not None:
+            scores[todo] = self.tfidf.score_rows(term.lower, todo)
+        elif todo.size:
+            subset = [self.index.sentences_lower[i] for i in todo.tolist()]
+            scores[todo], _ = score_sentences([term.text], subset, self.exact_match,
+                                              self.score_cutoff, self.workers)
+        return ids, scores[ids]
+
+    def verify(self, term, articles):
+        if not articles:
+            return set()
+        ids, scores = self.term_scores(term, articles)
+        return set(np.unique(self.index.sentence_articles[ids[scores >= self.threshold]]).tolist())
+
+    def best_matches(self, terms, articles):
+        """Best score and phrase per sentence over the positive terms, limited to matched articles."""
+        matrix = np.zeros((max(len(terms), 1), len(self.index)))
+        for row, term in enumerate(terms):
+            ids, scores = self.term_scores(term, articles)
+            matrix[row, ids] = np.where(scores >= self.threshold, scores, 0)
+        best_phrase = matrix.argmax(axis=0)
+        return matrix[best_phrase, np.arange(len(self.index))], best_phrase
+
+def score_query(query, related_articles, threshold=60, exact_match=False, verbose=True, workers=-1, index=None,
+                mode="fuzzy", shared=None, score_cutoff=None):
+    """
+    Evaluate a parsed boolean query. Articles that satisfy it report the sentences matching
+    its positive (non-negated) phrases; every other article comes back with no matches. An
+    article matched with no such sentence (e.g. by 'NOT Musk' alone) gets a single marker
+    match whose sentence is QUERY_MATCH_SENTENCE.
+    """
+    if index is None:
+        index = get_sentence_index(related_articles)
+
+    tfidf = get_tfidf_index(index) if mode == "tfidf" and not exact_match else None
+    ctx = _QueryScorer(index, threshold, exact_match, workers, tfidf, shared, score_cutoff)
+    matched = query.select(ctx, ctx.upper(query) & ctx.all_articles)
+    positive, _ = query_terms(query)
+    best_score, best_phrase = ctx.best_matches(positive, matched)
+
+    if verbose:
+        print(f"🧮 Query matched {len(matched)} of {len(ctx.all_articles)} articles")
+    phrases = [term.text for term in positive]
+    results = _build_results(related_articles, index, best_score, best_phrase, phrases, threshold, verbose)
+    for article_id in sorted(matched):
+        if not results[article_id]["matches"]:
+            results[article_id]["matches"].append(
+                {"sentence": QUERY_MATCH_SENTENCE, "score": 100.0, "phrase": repr(query)})
+    return results
+
+def cached_scores(index, key, compute):
+    """
+    Per-index LRU of raw scores (dropped together with the index). `compute` runs on a miss;
+    its result is shared, so callers must treat it as read-only (query score dicts only grow).
+    """
+    with _score_lock:
+        entries = _score_cache.get(index)
+        if entries is None:
+            entries = _score_cache[index] = OrderedDict()
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+    value = compute()
+    with _score_lock:
+        entries[key] = value
+        while len(entries) > MAX_CACHED_CLAIMS:
+            entries.popitem(last=False)
+    return value
+
+def score_claim(claim, related_articles, threshold=60, exact_match=False, verbose=True, workers=-1, index=None,
+                mode="fuzzy", top_k=DEFAULT_TOP_K):
+    """
+    Score a parse_claim() result (a phrase list or a boolean query) in one of MATCH_MODES.
+    Exact matching ignores the mode.
+
+    Raw per-sentence scores are cached per (claim, corpus index, mode, exact match) down to
+    SCORE_FLOORS[mode], so rerunning with another threshold at or above the floor only
+    re-selects matches from the cached scores.
+    """
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode {mode!r}; expected one of {MATCH_MODES}")
+    if index is None:
+        index = get_sentence_index(related_articles)
+    use_tfidf = mode == "tfidf" and not exact_match
+    floor = min(threshold, SCORE_FLOORS["tfidf" if use_tfidf else "fuzzy"])
+
+    if not isinstance(claim, list):
+        shared = cached_scores(index, ("query", use_tfidf, exact_match, floor), dict)
+        return score_query(claim, related_articles, threshold, exact_match, verbose, workers, index, mode,
+                           shared, floor)
+
+    if use_tfidf:
+        phrases_lower = [phrase.lower() for phrase in claim]
+        key = ("tfidf", tuple(claim), floor, top_k)
+        best_score, best_phrase = cached_scores(
+            index, key, lambda: get_tfidf_index(index).score(phrases_lower, floor, top_k))
+    else:
+        key = ("fuzzy", tuple(claim), exact_match, floor)
+        best_score, best_phrase = cached_scores(
+            index, key, lambda: corpus_scores(claim, index, exact_match, floor, workers))
+    return _build_results(related_articles, index, best_score, best_phrase, claim, threshold, verbose)
+
+def compare_claim_for_article(claim, article, threshold=60, exact_match=False, verbose=True, mode="fuzzy"):
+    """Score one article's sentences against a parse_claim() result."""
+    # A single article is cheaper to scan than to index
+    index = SentenceIndex([article], qgrams=())
+    return score_claim(claim, [article], threshold, exact_match, verbose, index=index, mode=mode)[0]
+
+def compare_claim_across_articles(claim_input, related_articles, threshold=60, exact_match=False,
+                                  verbose=True, workers=-1, mode="fuzzy", top_k=DEFAULT_TOP_K):
+    """
+    Compare a claim or set of key phrases across related articles.
+    Accepts related_articles directly instead of loading from file.
+    mode="tfidf" matches paraphrases by TF-IDF cosine similarity; its threshold is a
+    similarity percentage (around 30 is a reasonable start) rather than a fuzzy score.
+    """
+
+    if not related_articles:
+        print("❌ No related articles available for comparison.")
+        return []
+
+    claim = parse_claim(claim_input)
+    if isinstance(claim, list):
+        print(f"\n📌 Comparing against {len(claim)} key phrase(s): {claim}\n")
+    else:
+        print(f"\n📌 Evaluating boolean query: {claim!r}\n")
+
+    return score_claim(claim, related_articles, threshold, exact_match, verbose, workers, mode=mode, top_k=top_k)
+
+def compare_claims_batch(claim_inputs, related_articles, threshold=60, exact_match=False, verbose=True,
+                         workers=-1, mode="fuzzy", top_k=DEFAULT_TOP_K):
+    """
+    Compare many claims against the same articles. The corpus is split and indexed once, and
+    the phrases of all plain claims are scored into one matrix: each distinct phrase is scored
+    once, against only the sentences its q-grams can't rule out (cdist calls spread over
+    `workers` threads, or one sparse product in TF-IDF mode). Boolean queries share the
+    index and per-phrase scores. Returns {claim_input: results}, each in the shape returned by
+    compare_claim_across_articles; `verbose` prints one summary line per claim.
+    """
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode {mode!r}; expected one of {MATCH_MODES}")
+    if not related_articles:
+        print("❌ No related articles available for comparison.")
+        return {claim_input: [] for claim_input in claim_inputs}
+
+    index = get_sentence_index(related_articles)
+    claims = {claim_input: parse_claim(claim_input) for claim_input in claim_inputs}
+    use_tfidf = mode == "tfidf" and not exact_match
+
+    phrases_lower = list(dict.fromkeys(
+        phrase.lower() for claim in claims.values() if isinstance(claim, list) for phrase in claim))
+    row_of = {phrase: row for row, phrase in enumerate(phrases_lower)}
+
+    if use_tfidf:
+        matrix = get_tfidf_index(index).score_matrix(phrases_lower, threshold, top_k).T
+    else:
+        matrix = np.zeros((len(phrases_lower), len(index)))
+        # Each phrase keeps its own q-gram candidates; phrases with the same candidate set
+        # share one cdist call
+        groups = {}
+        for row, phrase in enumerate(phrases_lower):
+            candidates = index.candidate_ids(phrase, threshold, exact_match)
+            if candidates is None:
+                candidates = np.arange(len(index))
+            groups.setdefault(candidates.tobytes(), (candidates, []))[1].append(row)
+        for candidates, rows in groups.values():
+            if candidates.size:
+                subset = [index.sentences_lower[i] for i in candidates.tolist()]
+                matrix[np.ix_(rows, candidates)] = score_matrix(
+                    [phrases_lower[row] for row in rows], subset, exact_match, threshold, workers)
+
+    shared = {}
+    results = {}
+    for claim_input, claim in claims.items():
+        if isinstance(claim, list):
+            if claim:
+                best_score, best_phrase = best_per_sentence(matrix[[row_of[p.lower()] for p in claim]])
+            else:
+                best_score, best_phrase = np.zeros(len(index)), np.zeros(len(index), dtype=int)
+            results[claim_input] = _build_results(related_articles, index, best_score, best_phrase,
+                                                  claim, threshold, False)
+        else:
+            results[claim_input] = score_query(claim, related_articles, threshold, exact_match, False,
+                                               workers, index, mode, shared)
+        if verbose:
+            hits = sum(1 for result in results[claim_input] if result["matches"])
+            print(f"📌 {claim_input}: matches in {hits} of {len(related_articles)} articles")
     return results
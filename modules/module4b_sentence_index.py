@@ -0,0 +1,150 @@
+# modules/module4b_sentence_index.py
+
+import math
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+import numpy as np
+
+from modules.module1e_text_analysis import get_analysis, sentence_texts
+
+# Trigrams prune best at strict thresholds; bigrams survive more edits and take over below that
+QGRAMS = (3, 2)
+MAX_CACHED_INDEXES = 8
+EMPTY = np.zeros(0, dtype=np.int64)
+
+def has_usable_text(text):
+    return bool(text) and len(text.strip()) >= 20
+
+def corpus_key(articles):
+    """In-process corpus version: changes whenever any article's url or text changes."""
+    return hash(tuple((article.get("url"), article.get("text") or "") for article in articles))
+
+
+class SentenceIndex:
+    """
+    Character q-gram postings over every sentence of a corpus. Sentences come from each
+    article's ingestion-time analysis rather than being split again.
+
+    candidate_ids() uses the q-gram lemma to return a superset of the sentences whose
+    partial_ratio against a phrase can reach a threshold: a window w of the sentence
+    scoring >= T is within k = floor(2m(1 - T/100)) edits of the phrase (m = phrase length),
+    and any string within k edits keeps at least (m - q + 1) - k*q of the phrase's q-grams.
+    Sentences shorter than the phrase are always kept, because partial_ratio then slides
+    the sentence over the phrase instead. When no q leaves a positive bound the index
+    cannot prune and returns None (score everything).
+    """
+
+    def __init__(self, articles, qgrams=QGRAMS):
+        self.qgrams = tuple(qgrams)
+        self.spans = []
+        self.sentences_lower = []
+        postings = {q: defaultdict(list) for q in self.qgrams}
+
+        for article in articles:
+            text = article.get("text", "")
+            if not has_usable_text(text):
+                self.spans.append((None, 0, 0))
+                continue
+            pairs = sentence_texts(get_analysis(article), text)
+            sentences = [sentence for sentence, _ in pairs]
+            start = len(self.sentences_lower)
+            for _, lower in pairs:
+                sentence_id = len(self.sentences_lower)
+                self.sentences_lower.append(lower)
+                for q in self.qgrams:
+                    grams = postings[q]
+                    for gram in {lower[i:i + q] for i in range(len(lower) - q + 1)}:
+                        grams[gram].append(sentence_id)
+            self.spans.append((sentences, start, len(self.sentences_lower)))
+
+        # ids are appended in increasing order, so every postings list is already sorted
+        self.postings = {q: {gram: np.array(ids, dtype=np.int64) for gram, ids in grams.items()}
+                         for q, grams in postings.items()}
+        self.lengths = np.array([len(s) for s in self.sentences_lower], dtype=np.int64)
+        self.sentence_articles = np.zeros(len(self.sentences_lower), dtype=np.int64)
+        for article_id, (_, start, end) in enumerate(self.spans):
+            self.sentence_articles[start:end] = article_id
+
+    def __len__(self):
+        return len(self.sentences_lower)
+
+    def min_shared_grams(self, phrase_lower, q, threshold, exact_match=False):
+        m = len(phrase_lower)
+        grams = m - q + 1
+        if exact_match:
+            max_edits = 0
+        else:
+            # epsilon errs towards more edits, i.e. towards keeping candidates
+            max_edits = math.floor(2 * m * (100 - threshold) / 100 + 1e-9)
+        return grams - max_edits * q
+
+    def candidate_ids(self, phrase_lower, threshold, exact_match=False):
+        """Sorted sentence ids that could score >= threshold for this phrase, or None if all could."""
+        for q in self.qgrams:
+            required = self.min_shared_grams(phrase_lower, q, threshold, exact_match)
+            if required > 0:
+                break
+        else:
+            return None
+
+        postings = self.postings[q]
+        counts = Counter(phrase_lower[i:i + q] for i in range(len(phrase_lower) - q + 1))
+        total = sum(counts.values())
+
+        # Prefix filter: a sentence lacking grams that cover more than (total - required)
+        # phrase positions cannot reach `required`, so the rarest such grams bound the candidates.
+        ranked = sorted(counts.items(), key=lambda item: len(postings.get(item[0], EMPTY)))
+        prefix = []
+        covered = 0
+        for gram, count in ranked:
+            prefix.append(gram)
+            covered += count
+            if covered > total - required:
+                break
+        candidates = np.unique(np.concatenate([postings.get(gram, EMPTY) for gram in prefix]))
+
+        if candidates.size:
+            shared = np.zeros(candidates.size, dtype=np.int64)
+            for gram, count in counts.items():
+                post = postings.get(gram)
+                if post is None:
+                    continue
+                pos = np.minimum(np.searchsorted(post, candidates), post.size - 1)
+                shared += count * (post[pos] == candidates)
+            candidates = candidates[shared >= required]
+
+        if not exact_match:
+            candidates = np.union1d(candidates, np.nonzero(self.lengths < len(phrase_lower))[0])
+        return candidates
+
+    def candidates_for_phrases(self, phrases_lower, threshold, exact_match=False):
+        """Union of candidate ids over all phrases, or None when any phrase cannot be pruned."""
+        union = EMPTY
+        for phrase in phrases_lower:
+            ids = self.candidate_ids(phrase, threshold, exact_match)
+            if ids is None:
+                return None
+            union = np.union1d(union, ids)
+        return union
+
+
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def get_sentence_index(articles):
+    """SentenceIndex for a corpus, built once per corpus version and kept in a small LRU."""
+    key = corpus_key(articles)
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = SentenceIndex(articles)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > MAX_CACHED_INDEXES:
+            _index_cache.popitem(last=False)
+    return index
@@ -0,0 +1,210 @@
+# modules/module4c_boolean_query.py
+
+import re
+
+# NOT binds tighter than AND, AND tighter than OR. Operators must be upper case so that
+# "and"/"or"/"not" inside ordinary phrases stay literal text.
+OPERATORS = {"AND", "OR", "NOT"}
+
+TOKEN_PATTERN = re.compile(r'"([^"]*)"|([()])|([,;])|([^\s"(),;]+)')
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+class Term:
+    """A key phrase leaf, fuzzy-matched against sentences like any comma-separated phrase."""
+
+    def __init__(self, text):
+        self.text = text
+        self.lower = text.lower()
+
+    def terms(self, negated=False):
+        yield self, negated
+
+    def upper(self, ctx):
+        return ctx.candidate_articles(self)
+
+    def select(self, ctx, articles):
+        return ctx.verify(self, articles)
+
+    def __repr__(self):
+        return f'"{self.text}"'
+
+
+class And:
+    def __init__(self, children):
+        self.children = children
+
+    def terms(self, negated=False):
+        for child in self.children:
+            yield from child.terms(negated)
+
+    def upper(self, ctx):
+        result = None
+        for child in sorted(self.children, key=ctx.upper_size):
+            bound = ctx.upper(child)
+            result = bound if result is None else result & bound
+            if not result:
+                break
+        return result
+
+    def select(self, ctx, articles):
+        # cheapest (most selective) child first; later children only see the survivors
+        for child in sorted(self.children, key=ctx.upper_size):
+            if not articles:
+                break
+            articles = child.select(ctx, articles & ctx.upper(child))
+        return articles
+
+    def __repr__(self):
+        return "(" + " AND ".join(map(repr, self.children)) + ")"
+
+
+class Or:
+    def __init__(self, children):
+        self.children = children
+
+    def terms(self, negated=False):
+        for child in self.children:
+            yield from child.terms(negated)
+
+    def upper(self, ctx):
+        result = set()
+        for child in self.children:
+            result |= ctx.upper(child)
+        return result
+
+    def select(self, ctx, articles):
+        matched = set()
+        remaining = set(articles)
+        for child in self.children:
+            if not remaining:
+                break
+            hits = child.select(ctx, remaining & ctx.upper(child))
+            matched |= hits
+            remaining -= hits
+        return matched
+
+    def __repr__(self):
+        return "(" + " OR ".join(map(repr, self.children)) + ")"
+
+
+class Not:
+    def __init__(self, child):
+        self.child = child
+
+    def terms(self, negated=False):
+        yield from self.child.terms(not negated)
+
+    def upper(self, ctx):
+        # excluding a phrase needs it verified, so the index cannot narrow a NOT
+        return set(ctx.all_articles)
+
+    def select(self, ctx, articles):
+        return articles - self.child.select(ctx, articles & ctx.upper(self.child))
+
+    def __repr__(self):
+        return f"NOT {self.child!r}"
+
+
+def is_boolean_query(claim_input):
+    """
+    True when the claim uses AND/OR/NOT as separate words outside quotes. Parentheses and
+    quotes alone (e.g. 'He said "no deal"') leave a claim in plain phrase matching.
+    """
+    return any(word in OPERATORS for _, _, _, word in TOKEN_PATTERN.findall(claim_input or ""))
+
+
+def tokenize(claim_input):
+    tokens = []
+    for quoted, paren, separator, word in TOKEN_PATTERN.findall(claim_input):
+        if paren:
+            tokens.append(("paren", paren))
+        elif separator:
+            tokens.append(("op", "OR"))  # commas/semicolons keep their old meaning: any of
+        elif word in OPERATORS:
+            tokens.append(("op", word))
+        elif word:
+            # adjacent bare words form one phrase, as in the comma-separated claim format
+            if tokens and tokens[-1][0] == "word":
+                tokens[-1] = ("word", tokens[-1][1] + " " + word)
+            else:
+                tokens.append(("word", word))
+        elif quoted.strip():
+            tokens.append(("phrase", quoted.strip()))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("empty query")
+        node = self.or_expr()
+        if self.pos != len(self.tokens):
+            raise QuerySyntaxError(f"unexpected {self.peek()[1]!r}")
+        return node
+
+    def or_expr(self):
+        children = [self.and_expr()]
+        while self.peek() == ("op", "OR"):
+            self.take()
+            children.append(self.and_expr())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def and_expr(self):
+        children = [self.not_expr()]
+        while True:
+            kind, value = self.peek()
+            if (kind, value) == ("op", "AND"):
+                self.take()
+            elif not (kind in ("word", "phrase") or (kind, value) in (("op", "NOT"), ("paren", "("))):
+                break
+            children.append(self.not_expr())  # juxtaposed operands are an implicit AND
+        return children[0] if len(children) == 1 else And(children)
+
+    def not_expr(self):
+        if self.peek() == ("op", "NOT"):
+            self.take()
+            return Not(self.not_expr())
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.take()
+        if kind in ("word", "phrase"):
+            return Term(value)
+        if (kind, value) == ("paren", "("):
+            node = self.or_expr()
+            if self.take() != ("paren", ")"):
+                raise QuerySyntaxError("missing closing parenthesis")
+            return node
+        raise QuerySyntaxError(f"expected a phrase, got {value!r}" if value else "query ends with an operator")
+
+
+def parse_query(claim_input):
+    """Compile a boolean claim such as 'Trump AND (Ukraine OR "peace talks") NOT Musk' into a tree."""
+    return _Parser(tokenize(claim_input)).parse()
+
+
+def query_terms(query):
+    """Distinct leaves of a query as (positive terms, negated terms), in query order."""
+    positive, negative, seen = [], [], set()
+    for term, negated in query.terms():
+        key = (term.lower, negated)
+        if key not in seen:
+            seen.add(key)
+            (negative if negated else positive).append(term)
+    return positive, negative
@@ -0,0 +1,87 @@
+# modules/module4d_tfidf_index.py
+
+import threading
+import weakref
+
+import numpy as np
+
+from modules.module0_model_registry import lazy_import
+
+# Matches kept per phrase in TF-IDF mode, best first
+DEFAULT_TOP_K = 100
+
+
+class TfidfSentenceIndex:
+    """
+    Sparse TF-IDF matrix over the sentences of a SentenceIndex (rows line up with its
+    sentence ids). A phrase scores a sentence by cosine similarity × 100, so word order
+    and inflection-free rewordings still match where character-level scores would not.
+    """
+
+    def __init__(self, index):
+        # scikit-learn takes seconds to import, so it is only loaded once TF-IDF mode is used
+        text = lazy_import("sklearn.feature_extraction.text")
+        self.vectorizer = text.TfidfVectorizer(lowercase=False, ngram_range=(1, 2), sublinear_tf=True,
+                                          stop_words="english", dtype=np.float32)
+        try:
+            self.matrix = self.vectorizer.fit_transform(index.sentences_lower).tocsr()
+        except ValueError:
+            # empty corpus, or nothing but stop words
+            self.matrix = None
+        self.columns = self.matrix.tocsc() if self.matrix is not None else None
+        self.size = len(index)
+
+    def vectorize(self, phrases_lower):
+        return self.vectorizer.transform(phrases_lower)
+
+    def score_matrix(self, phrases_lower, threshold, top_k=DEFAULT_TOP_K):
+        """
+        sentences×phrases scores from one sparse product. Each phrase keeps only its `top_k`
+        highest-scoring sentences at or above the threshold; everything else is 0.
+        """
+        if self.matrix is None or not phrases_lower:
+            return np.zeros((self.size, len(phrases_lower)))
+
+        scores = (self.matrix @ self.vectorize(phrases_lower).T).toarray().astype(np.float64) * 100
+        for column in scores.T:
+            hits = np.flatnonzero(column >= threshold)
+            if top_k and hits.size > top_k:
+                keep = hits[np.argpartition(column[hits], -top_k)[-top_k:]]
+                column[np.setdiff1d(hits, keep)] = 0
+            column[column < threshold] = 0
+        return scores
+
+    def score(self, phrases_lower, threshold, top_k=DEFAULT_TOP_K):
+        """Best score and best phrase index per sentence (0 where no phrase clears the threshold)."""
+        if not phrases_lower:
+            return np.zeros(self.size), np.zeros(self.size, dtype=int)
+        scores = self.score_matrix(phrases_lower, threshold, top_k)
+        best_phrase = scores.argmax(axis=1)
+        return scores[np.arange(self.size), best_phrase], best_phrase
+
+    def candidate_ids(self, phrase_lower):
+        """Sentences sharing at least one term with the phrase; all others score 0."""
+        if self.matrix is None:
+            return np.zeros(0, dtype=np.int64)
+        terms = self.vectorize([phrase_lower]).indices
+        return np.unique(self.columns[:, terms].indices).astype(np.int64)
+
+    def score_rows(self, phrase_lower, ids):
+        if self.matrix is None or not len(ids):
+            return np.zeros(len(ids))
+        query = self.vectorize([phrase_lower])
+        return (self.matrix[ids] @ query.T).toarray().ravel().astype(np.float64) * 100
+
+
+_tfidf_cache = weakref.WeakKeyDictionary()
+_tfidf_lock = threading.Lock()
+
+
+def get_tfidf_index(index):
+    """TF-IDF matrix for a SentenceIndex, built on first use and dropped with the index."""
+    with _tfidf_lock:
+        tfidf = _tfidf_cache.get(index)
+        if tfidf is None:
+            tfidf = TfidfSentenceIndex(index)
+            _tfidf_cache[index] = tfidf
+        return tfidf
@@ -4,12 +4,23 @@ from dotenv import load_dotenv
 
 load_dotenv()
 API_KEY = os.getenv("FACT_CHECK_API_KEY")
+FACT_CHECK_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
 
-def fact_check_claim(claim_text):
-    url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+def search_fact_checks(claim_text, session=None, timeout=None):
+    """Google Fact Check claims for a text; raises on network or HTTP errors."""
     params = {"query": claim_text, "key": API_KEY, "languageCode": "en-US", "pageSize": 5}
-    response = requests.get(url, params=params)
+    try:
+        response = (session or requests).get(FACT_CHECK_URL, params=params, timeout=timeout)
+    except requests.RequestException as e:
+        # connection errors quote the request URL, API key included
+        raise type(e)(str(e).replace(API_KEY, "***") if API_KEY else str(e)) from None
     if response.status_code != 200:
+        # not raise_for_status(): its message would carry the request URL, API key included
+        raise requests.HTTPError(f"{response.status_code} from the Google Fact Check API", response=response)
+    return response.json().get("claims", [])
+
+def fact_check_claim(claim_text, session=None, timeout=None):
+    try:
+        return search_fact_checks(claim_text, session, timeout)
+    except requests.RequestException:
         return []
-    data = response.json()
-    return data.get("claims", [])
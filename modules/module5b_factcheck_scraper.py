@@ -1,9 +1,12 @@
 import requests
 from bs4 import BeautifulSoup
 
-def search_politifact(claim):
+def search_politifact(claim, session=None, timeout=None):
+    """Up to 5 PolitiFact rulings for a claim. Raises requests.HTTPError on a 4xx/5xx response
+    (it used to return [] for error pages), and other requests exceptions on network failure."""
     url = f"https://www.politifact.com/search/?q={claim.replace(' ', '+')}"
-    res = requests.get(url)
+    res = (session or requests).get(url, timeout=timeout)
+    res.raise_for_status()
     soup = BeautifulSoup(res.text, 'html.parser')
     results = []
     for item in soup.select("ul.o-listicle__items li")[:5]:
@@ -13,9 +16,12 @@ def search_politifact(claim):
         results.append({"title": title, "url": link, "rating": rating})
     return results
 
-def search_snopes(claim):
+def search_snopes(claim, session=None, timeout=None):
+    """Up to 5 Snopes articles for a claim. Raises requests.HTTPError on a 4xx/5xx response
+    (it used to return [] for error pages), and other requests exceptions on network failure."""
     url = f"https://www.snopes.com/search/{claim.replace(' ', '%20')}/"
-    res = requests.get(url)
+    res = (session or requests).get(url, timeout=timeout)
+    res.raise_for_status()
     soup = BeautifulSoup(res.text, 'html.parser')
     results = []
     for article in soup.select("article.media-list__item")[:5]:
@@ -0,0 +1,175 @@
+# modules/module5c_factcheck_aggregator.py
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from modules.module1c_article_cache import CACHE_DIR
+from modules.module5_factcheck import API_KEY, search_fact_checks
+from modules.module5b_factcheck_scraper import search_politifact, search_snopes
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# provider → (search function, (connect, read) timeout in seconds)
+PROVIDERS = {
+    "google": (search_fact_checks, (3.05, 8)),
+    "politifact": (search_politifact, (3.05, 10)),
+    "snopes": (search_snopes, (3.05, 10)),
+}
+# Whole fan-out gives up on stragglers after this long, returning whatever has arrived
+DEADLINE = 20
+# Connection errors and 429/5xx responses are retried twice with exponential backoff (at most
+# 1s); read timeouts are not, so a hanging site costs one timeout rather than three
+RETRIES = 2
+BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_TTL = int(os.getenv("ECHOLENS_FACTCHECK_TTL", 6 * 60 * 60))
+
+
+def normalize_claim(claim):
+    """Case- and whitespace-insensitive cache key for a claim."""
+    return re.sub(r"\s+", " ", claim).strip().lower()
+
+
+class FactCheckCache:
+    """On-disk cache of successful provider results: (normalized claim, provider) → result list."""
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "factchecks.sqlite3")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS factchecks (
+                claim TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                results TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (claim, provider)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, claim, provider):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, fetched_at FROM factchecks WHERE claim = ? AND provider = ?",
+                (normalize_claim(claim), provider)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, claim, provider, results):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO factchecks (claim, provider, results, fetched_at) VALUES (?, ?, ?, ?)",
+                (normalize_claim(claim), provider, json.dumps(results), time.time())
+            )
+            self._conn.execute("DELETE FROM factchecks WHERE fetched_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+
+
+def make_session(retries=RETRIES, backoff=BACKOFF):
+    """Keep-alive session whose adapter retries connection errors and 429/5xx responses with bounded backoff."""
+    retry = Retry(total=retries, connect=retries, read=0, status=retries, backoff_factor=backoff,
+                  status_forcelist=RETRY_STATUSES, allowed_methods=frozenset(["GET"]),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=len(PROVIDERS), pool_maxsize=4)
+    session = requests.Session()
+    session.headers["User-Agent"] = "Mozilla/5.0 (compatible; EchoLens)"
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=2 * len(PROVIDERS), thread_name_prefix="echolens-factcheck")
+_local = threading.local()
+
+
+def get_factcheck_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = FactCheckCache()
+        return _default_cache
+
+
+def _session():
+    # requests sessions are not thread-safe; each long-lived worker thread keeps its own pool
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = make_session()
+        _local.session = session
+    return session
+
+
+def _query(provider, claim):
+    search, timeout = PROVIDERS[provider]
+    start = time.perf_counter()
+    results = search(claim, session=_session(), timeout=timeout)
+    logging.info(f"Fact check {provider}: {len(results)} results in {time.perf_counter() - start:.2f}s")
+    return results
+
+
+def check_claim(claim, providers=None, deadline=DEADLINE, use_cache=True):
+    """
+    Query every fact-check provider for a claim concurrently, so the step takes as long as the
+    slowest provider. Returns {"results": {provider: list}, "errors": {provider: message},
+    "cached": [providers served from cache]}; a provider that fails or misses the deadline
+    only adds an error, and only successful results are cached.
+    """
+    providers = list(providers or PROVIDERS)
+    cache = get_factcheck_cache() if use_cache else None
+    report = {"results": {}, "errors": {}, "cached": []}
+
+    pending = {}
+    for provider in providers:
+        cached = cache.get(claim, provider) if cache is not None else None
+        if cached is not None:
+            report["results"][provider] = cached
+            report["cached"].append(provider)
+        elif provider == "google" and not API_KEY:
+            report["errors"][provider] = "FACT_CHECK_API_KEY is not set"
+        else:
+            pending[_executor.submit(_query, provider, claim)] = provider
+
+    done, late = wait(pending, timeout=deadline)
+    for future in done:
+        provider = pending[future]
+        try:
+            results = future.result()
+        except Exception as e:
+            logging.warning(f"Fact check {provider} failed for '{claim}': {e}")
+            report["errors"][provider] = f"{type(e).__name__}: {e}"
+            continue
+        report["results"][provider] = results
+        if cache is not None:
+            cache.put(claim, provider, results)
+    for future in late:
+        provider = pending[future]
+        logging.warning(f"Fact check {provider} missed the {deadline}s deadline for '{claim}'")
+        report["errors"][provider] = f"no response within {deadline}s"
+
+    for provider in providers:
+        report["results"].setdefault(provider, [])
+    return report
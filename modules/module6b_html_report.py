@@ -61,6 +61,9 @@ def generate_html_report(claim, match_results, core_results, fact_check_data=Non
         html.append(f"<p><strong>Verdict:</strong> <span class='verdict'>{article['verdict']}</span></p>")
         html.append(f"<p><strong>Entity Score:</strong> {article['entity_score']}% | <strong>Title Score:</strong> {article['title_score']}%</p>")
         html.append(f"<p><strong>Date Nearby:</strong> {article['same_date_window']}</p>")
+        if article.get("mirrors"):
+            links = ", ".join(f"<a href='{m['url']}' target='_blank'>{m['domain']}</a>" for m in article["mirrors"])
+            html.append(f"<p><strong>Also published by:</strong> {links}</p>")
 
         if article.get("matches"):
             html.append("<h3>Matching Sentences:</h3>")
@@ -0,0 +1,179 @@
+# modules/module7c_incident_clustering.py
+
+import datetime
+import logging
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from modules.module1d_date_extraction import extract_dates
+from modules.module1e_text_analysis import ensure_entities
+from modules.module7_core_match import DATE_WINDOW_DAYS, incident_verdict, simple_similarity
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+NUM_PERM = 64
+# 16 bands of 4 rows: pairs above ~0.5 Jaccard collide in some band with high probability
+BANDS = 16
+SHINGLE_SIZE = 3
+# Verdicts that merge two articles into one incident; "Possibly Related" links are reported but
+# not merged, since chaining weak links through union-find snowballs unrelated stories together
+LINK_VERDICTS = ("Likely Same Incident",)
+
+# Universal hashes (a*x + b) mod p with p the largest prime below 2**32 and a, b, x all reduced
+# below p, so a*x + b <= p*(p - 1) never wraps around in uint64
+_PRIME = np.uint64(4294967291)
+_rng = np.random.RandomState(20240501)
+_PERM_A = _rng.randint(1, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+
+
+def title_shingles(title):
+    """Character shingles of a headline with case and punctuation removed."""
+    words = re.findall(r"\w+", (title or "").lower())
+    text = " ".join(words)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(tokens):
+    """NUM_PERM-value MinHash signature of a token set, or None for an empty set."""
+    if not tokens:
+        return None
+    hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    hashes %= _PRIME
+    return ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME).min(axis=1)
+
+
+def lsh_buckets(signatures, bands=BANDS):
+    """Groups of article indexes whose signatures agree on every row of at least one band."""
+    rows = NUM_PERM // bands
+    buckets = defaultdict(list)
+    for i, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for band in range(bands):
+            buckets[(band, signature[band * rows:(band + 1) * rows].tobytes())].append(i)
+    return [members for members in buckets.values() if len(members) > 1]
+
+
+def _window_pairs(members, ordinals, window):
+    """Pairs in one bucket published within `window` days of each other (sorted sweep)."""
+    members = sorted(members, key=lambda i: ordinals[i])
+    for pos, i in enumerate(members):
+        for j in members[pos + 1:]:
+            if ordinals[j] - ordinals[i] > window:
+                break
+            yield (i, j) if i < j else (j, i)
+
+
+def pair_scores(original, related):
+    """
+    score_incident's entity and title scores for a pair of articles, with `original` in the role
+    of the original article: entity overlap relative to its entity set and the difflib title
+    ratio, so incident_verdict's thresholds mean the same thing here.
+    """
+    original_ents, related_ents = set(original["ents"]), set(related["ents"])
+    if original_ents and related_ents:
+        entity_score = round(len(original_ents & related_ents) / len(original_ents) * 100, 2)
+    else:
+        entity_score = 0.0
+    title_score = round(simple_similarity(original["title"], related["title"]) * 100, 2)
+    return entity_score, title_score
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def cluster_incidents(articles, entity_lists=None, window=DATE_WINDOW_DAYS, bands=BANDS,
+                      link_verdicts=LINK_VERDICTS):
+    """
+    Group a corpus into incidents without comparing every pair of articles.
+
+    Title shingles and entity sets are MinHashed and banded (LSH); only articles that collide
+    in a band and were published within `window` days of each other are scored. Each candidate
+    pair is scored exactly as score_incident would score the later article against the earlier
+    one (see pair_scores), giving the same entity_score, title_score, same_date_window and
+    verdict fields. Pairs whose verdict is in `link_verdicts` are merged with union-find.
+    Undated articles never share a date window, so they stay on their own.
+
+    Sets article['incident_id'] on every article and returns (clusters, links): clusters are
+    {incident_id, members, size, first_date, last_date} sorted by size, links are the scored pairs.
+    """
+    if entity_lists is None:
+        entity_lists = ensure_entities(articles)
+    dates = extract_dates(articles)
+
+    ordinals = []
+    for date in dates:
+        try:
+            ordinals.append(datetime.date.fromisoformat(date).toordinal() if date else None)
+        except ValueError:
+            ordinals.append(None)
+
+    shingles = [title_shingles(a.get("title")) for a in articles]
+    entities = [{e.lower() for e in ents or ()} for ents in entity_lists]
+    dated = [o is not None for o in ordinals]
+
+    candidates = set()
+    for sets in (shingles, entities):
+        signatures = [minhash(s) if ok else None for s, ok in zip(sets, dated)]
+        for members in lsh_buckets(signatures, bands):
+            candidates.update(_window_pairs(members, ordinals, window))
+
+    # the same inputs score_incident takes from prepare_original(): raw entity strings and the title
+    scored = [{"title": a.get("title") or "", "ents": ents or ()} for a, ents in zip(articles, entity_lists)]
+
+    union = _UnionFind(len(articles))
+    links = []
+    for i, j in sorted(candidates):
+        # the earlier article plays the original, as it would when the later one is found as related coverage
+        first, second = (i, j) if ordinals[i] <= ordinals[j] else (j, i)
+        entity_score, title_score = pair_scores(scored[first], scored[second])
+        verdict = incident_verdict(entity_score, title_score, True)
+        links.append({"a": i, "b": j, "entity_score": entity_score, "title_score": title_score,
+                      "same_date_window": True, "verdict": verdict})
+        if verdict in link_verdicts:
+            union.union(i, j)
+
+    groups = defaultdict(list)
+    for i in range(len(articles)):
+        groups[union.find(i)].append(i)
+
+    clusters = []
+    for incident_id, members in enumerate(sorted(groups.values(), key=lambda m: (-len(m), m[0]))):
+        member_dates = sorted(dates[i] for i in members if dates[i])
+        clusters.append({
+            "incident_id": incident_id,
+            "members": members,
+            "size": len(members),
+            "first_date": member_dates[0] if member_dates else None,
+            "last_date": member_dates[-1] if member_dates else None,
+        })
+        for i in members:
+            articles[i]["incident_id"] = incident_id
+
+    logging.info(f"Clustered {len(articles)} articles into {len(clusters)} incidents "
+                 f"from {len(candidates)} candidate pairs")
+    return clusters, links
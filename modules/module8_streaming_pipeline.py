@@ -0,0 +1,129 @@
+# modules/module8_streaming_pipeline.py
+
+import logging
+from collections import defaultdict
+
+from modules.module3b_fetch_pool import (
+    FetchPool, DEFAULT_WORKERS, DEFAULT_PER_DOMAIN, PARSE_WORKERS,
+    CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RESPONSE_BYTES
+)
+from modules.module3c_near_duplicates import iter_unique_articles
+from modules.module4_claim_comparator import parse_claim, compare_claim_for_article, score_claim
+from modules.module1e_text_analysis import NER_BATCH_SIZE, ensure_entities
+from modules.module7_core_match import prepare_original, score_incident
+
+# Fields score_incident adds; they depend only on the article and the original, never on the claim
+INCIDENT_FIELDS = ("entity_score", "title_score", "same_date_window", "verdict")
+
+logging.basicConfig(
+    filename='echolens.log',
+    level=logging.INFO,
+    format='[%(asctime)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+
+def iter_fetch_records(url_list, workers=DEFAULT_WORKERS, per_domain=DEFAULT_PER_DOMAIN,
+                       connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                       max_bytes=MAX_RESPONSE_BYTES, parse_workers=PARSE_WORKERS):
+    """Yield {url, article, error} records in completion order."""
+    pool = FetchPool(workers, per_domain, connect_timeout, read_timeout, max_bytes, parse_workers)
+    yield from pool.iter_completed(url_list)
+
+
+def iter_in_input_order(records, url_list):
+    """
+    Re-emit completion-ordered fetch records in `url_list` order: each record is held back only
+    until every URL ranked above it has finished (successfully or not).
+    """
+    positions = defaultdict(list)
+    for position, url in enumerate(url_list):
+        positions[url].append(position)
+    waiting = {}
+    next_position = 0
+    for record in records:
+        waiting[positions[record["url"]].pop(0)] = record
+        while next_position in waiting:
+            yield waiting.pop(next_position)
+            next_position += 1
+
+
+def iter_related_articles(url_list, errors=None, in_order=False, **pool_options):
+    """
+    Yield extracted article dicts as each site finishes (or, with `in_order`, in `url_list`
+    order as soon as every higher-ranked site has finished); failures go to `errors` if given.
+    """
+    url_list = list(url_list)
+    records = iter_fetch_records(url_list, **pool_options)
+    if in_order:
+        records = iter_in_input_order(records, url_list)
+    for record in records:
+        if record["error"]:
+            print(f"⚠️ Failed to extract {record['url']}: {record['error']}")
+            if errors is not None:
+                errors.append({"url": record["url"], "error": record["error"]})
+            continue
+        yield record["article"]
+
+
+def _with_entities(match_results, batch_size=NER_BATCH_SIZE):
+    """Yield match results after running NER over them one batch at a time."""
+    batch = []
+    for match_result in match_results:
+        batch.append(match_result)
+        if len(batch) == batch_size:
+            ensure_entities([m for m in batch if m.get("text")])
+            yield from batch
+            batch = []
+    ensure_entities([m for m in batch if m.get("text")])
+    yield from batch
+
+
+def stream_analysis(articles, claim_input, original_article, threshold=60, exact_match=False, index=None,
+                    mode="fuzzy", incidents=None):
+    """
+    Run claim comparison and incident scoring one article at a time.
+    Yields (match_result, core_result) pairs; core_result is None for articles without text.
+    When `articles` is an already-ingested list with its sentence `index`, claim comparison
+    runs once over the index and NER runs in batches while incident scoring is streamed.
+    `incidents` is a {url: incident fields} dict kept by the caller for one original and corpus;
+    articles found in it skip incident scoring (and NER), and new scores are added to it.
+    """
+    claim = parse_claim(claim_input)
+    original = None if incidents else prepare_original(original_article)
+
+    if index is not None:
+        match_results = score_claim(claim, articles, threshold, exact_match, index=index, mode=mode)
+        if not incidents:
+            match_results = _with_entities(match_results)
+    else:
+        match_results = (compare_claim_for_article(claim, article, threshold, exact_match, mode=mode)
+                         for article in articles)
+
+    for match_result in match_results:
+        cached = incidents.get(match_result["url"]) if incidents is not None else None
+        if cached is not None:
+            match_result.update(cached)
+            yield match_result, match_result
+            continue
+        try:
+            if original is None:
+                original = prepare_original(original_article)
+            core_result = score_incident(match_result, original)
+            if core_result is not None and incidents is not None:
+                incidents[match_result["url"]] = {field: core_result[field] for field in INCIDENT_FIELDS}
+        except Exception as e:
+            logging.error(f"Error during incident matching for {match_result.get('url')}: {e}")
+            core_result = None
+        yield match_result, core_result
+
+
+def stream_pipeline(url_list, claim_input, original_article, threshold=60, exact_match=False,
+                    errors=None, **pool_options):
+    """
+    Extraction → claim comparison → incident scoring, yielding each article as soon as it is ready.
+    Articles are released in search-rank order, so the canonical copy of a syndicated story is
+    its highest-ranked outlet; later copies are only added to its 'mirrors'.
+    """
+    articles = iter_unique_articles(iter_related_articles(url_list, errors=errors, in_order=True, **pool_options))
+    yield from stream_analysis(articles, claim_input, original_article, threshold, exact_match)
@@ -0,0 +1,210 @@
+# modules/module9_article_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+STORE_PATH = os.getenv("ECHOLENS_STORE_PATH", "echolens_articles.sqlite3")
+# Only the newest sessions are kept; every save() drops the rest, so the file stays bounded
+KEEP_SESSIONS = int(os.getenv("ECHOLENS_STORE_SESSIONS", 50))
+
+LAZY_FIELDS = ("text", "authors", "mirrors")
+
+
+class LazyArticle(dict):
+    """
+    Article metadata dict whose 'text', 'authors' and 'mirrors' are read from the store on
+    first access; 'analysis' is not stored and comes from the analysis cache via get_analysis(). dict(article) and json.dumps(article) only see fields loaded so far;
+    use to_dict() for a complete plain copy. Pickled articles carry every field but not the store.
+    """
+
+    def __init__(self, meta, store=None):
+        super().__init__(meta)
+        self._store = store
+
+    def __missing__(self, key):
+        if self._store is None:
+            raise KeyError(key)
+        if key == "text":
+            text = self._store.get_text(dict.__getitem__(self, "id"))
+            self["text"] = text
+            return text
+        if key == "authors":
+            # stored as JSON; decoded lazily because listing a corpus rarely needs it
+            authors = json.loads(self._store.get_authors(dict.__getitem__(self, "id")) or "[]")
+            self["authors"] = authors
+            return authors
+        if key == "mirrors":
+            mirrors = json.loads(self._store.get_mirrors(dict.__getitem__(self, "id")) or "[]")
+            self["mirrors"] = mirrors
+            return mirrors
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in LAZY_FIELDS or dict.__contains__(self, key)
+
+    def copy(self):
+        return LazyArticle(self, self._store)
+
+    def to_dict(self):
+        """Plain dict with every field loaded, e.g. for JSON export."""
+        for key in LAZY_FIELDS:
+            if not dict.__contains__(self, key):
+                self.get(key)
+        return dict(self)
+
+    def __reduce__(self):
+        # the store holds a sqlite connection and a lock, so it stays behind
+        return LazyArticle, (self.to_dict(),)
+
+
+class ArticleStore:
+    """
+    SQLite article store: metadata and bodies live in separate tables so listing a corpus
+    never reads article text. Every save() gets its own session id, so concurrent users
+    (or CLI runs) append side by side instead of overwriting one shared JSON file. Sessions
+    beyond the newest `keep_sessions` are pruned on save.
+    """
+
+    def __init__(self, path=STORE_PATH, keep_sessions=KEEP_SESSIONS):
+        self.path = path
+        self.keep_sessions = keep_sessions
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS article_meta (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                collection TEXT NOT NULL,
+                session TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                url TEXT,
+                title TEXT,
+                authors TEXT,
+                publish_date TEXT,
+                top_image TEXT,
+                text_length INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS article_body (
+                id INTEGER PRIMARY KEY REFERENCES article_meta (id) ON DELETE CASCADE,
+                text TEXT
+            );
+            DROP TABLE IF EXISTS article_analysis;
+            CREATE TABLE IF NOT EXISTS article_mirrors (
+                id INTEGER PRIMARY KEY REFERENCES article_meta (id) ON DELETE CASCADE,
+                mirrors TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_meta_session ON article_meta (collection, session, position);
+            CREATE INDEX IF NOT EXISTS idx_meta_created ON article_meta (collection, created_at);
+        """)
+        self._conn.commit()
+
+    def save(self, articles, collection="related", session=None):
+        """
+        Append articles as one atomic batch and return the session id they were stored under.
+        Sessions older than the newest `keep_sessions` are dropped in the same transaction.
+        """
+        session = session or uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                start = self._conn.execute(
+                    "SELECT COALESCE(MAX(position) + 1, 0) FROM article_meta WHERE collection = ? AND session = ?",
+                    (collection, session)
+                ).fetchone()[0]
+                for position, article in enumerate(articles, start=start):
+                    text = article.get("text") or ""
+                    cursor = self._conn.execute(
+                        "INSERT INTO article_meta (collection, session, position, url, title, authors, "
+                        "publish_date, top_image, text_length, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (collection, session, position, article.get("url"), article.get("title"),
+                         json.dumps(article.get("authors") or []), article.get("publish_date"),
+                         article.get("top_image"), len(text), now)
+                    )
+                    self._conn.execute("INSERT INTO article_body (id, text) VALUES (?, ?)", (cursor.lastrowid, text))
+                    mirrors = article.get("mirrors")
+                    if mirrors:
+                        self._conn.execute("INSERT INTO article_mirrors (id, mirrors) VALUES (?, ?)",
+                                           (cursor.lastrowid, json.dumps(mirrors)))
+                if self.keep_sessions:
+                    self._prune(self.keep_sessions)
+        return session
+
+    def latest_session(self, collection):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT session FROM article_meta WHERE collection = ? ORDER BY created_at DESC, id DESC LIMIT 1",
+                (collection,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def load(self, collection="related", session=None):
+        """Metadata for one session (latest by default) as LazyArticle dicts; bodies load on first access."""
+        session = session or self.latest_session(collection)
+        if session is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, url, title, publish_date, top_image, text_length FROM article_meta "
+                "WHERE collection = ? AND session = ? ORDER BY position",
+                (collection, session)
+            ).fetchall()
+
+        columns = ("id", "url", "title", "publish_date", "top_image", "text_length")
+        return [LazyArticle(zip(columns, row), self) for row in rows]
+
+    def load_one(self, collection="original", session=None):
+        articles = self.load(collection, session)
+        return articles[0] if articles else None
+
+    def get_text(self, article_id):
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM article_body WHERE id = ?", (article_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_authors(self, article_id):
+        with self._lock:
+            row = self._conn.execute("SELECT authors FROM article_meta WHERE id = ?", (article_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_mirrors(self, article_id):
+        with self._lock:
+            row = self._conn.execute("SELECT mirrors FROM article_mirrors WHERE id = ?", (article_id,)).fetchone()
+        return row[0] if row else None
+
+    def prune(self, keep_sessions=KEEP_SESSIONS):
+        """Drop every article outside the newest `keep_sessions` sessions."""
+        with self._lock:
+            with self._conn:
+                self._prune(keep_sessions)
+
+    def _prune(self, keep_sessions):
+        self._conn.execute("""
+            DELETE FROM article_meta WHERE session NOT IN (
+                SELECT session FROM article_meta GROUP BY session
+                ORDER BY MAX(created_at) DESC, MAX(id) DESC LIMIT ?
+            )
+        """, (keep_sessions,))
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_article_store():
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ArticleStore()
+        return _default_store
@@ -0,0 +1,52 @@
+# tests/test_article_cache.py
+
+import itertools
+
+import pytest
+
+from modules import module1c_article_cache
+from modules.module1c_article_cache import ArticleCache, normalize_url
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    ticks = itertools.count(1000)
+
+    def time():
+        # every call moves the clock forward, so access order is never a tie
+        return float(next(ticks))
+
+    monkeypatch.setattr(module1c_article_cache.time, "time", time)
+    return ticks
+
+
+def test_entries_go_stale_after_the_ttl(tmp_path, clock):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"), ttl=5)
+    cache.put("https://a.com/x", {"title": "a"}, etag='"v1"')
+    assert cache.lookup("https://a.com/x")["fresh"]
+    for _ in range(5):
+        next(clock)
+    entry = cache.lookup("https://a.com/x")
+    assert not entry["fresh"] and entry["etag"] == '"v1"' and entry["payload"] == {"title": "a"}
+    assert cache.get("https://a.com/x") is None
+    cache.touch("https://a.com/x")
+    assert cache.get("https://a.com/x") == {"title": "a"}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"), max_entries=2)
+    cache.put("https://a.com/1", {"n": 1})
+    cache.put("https://a.com/2", {"n": 2})
+    cache.lookup("https://a.com/1")
+    cache.put("https://a.com/3", {"n": 3})
+    assert len(cache) == 2
+    assert cache.lookup("https://a.com/2") is None
+    assert cache.get("https://a.com/1") == {"n": 1}
+    assert cache.get("https://a.com/3") == {"n": 3}
+
+
+def test_urls_are_normalized_and_analysis_is_not_stored(tmp_path):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite3"))
+    cache.put("https://www.A.com/story/?utm_source=x#top", {"title": "a", "analysis": {"tokens": []}})
+    assert normalize_url("https://a.com/story") == normalize_url("https://www.a.com/story/?fbclid=1")
+    assert cache.get("https://a.com/story") == {"title": "a"}
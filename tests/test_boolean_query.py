@@ -0,0 +1,42 @@
+# tests/test_boolean_query.py
+
+import pytest
+
+from modules.module4_claim_comparator import QUERY_MATCH_SENTENCE, compare_claim_across_articles, parse_claim
+from modules.module4c_boolean_query import QuerySyntaxError, is_boolean_query, parse_query
+
+
+def test_not_binds_tighter_than_and_and_and_tighter_than_or():
+    assert repr(parse_query("Trump OR Ukraine AND NOT Musk")) == '("Trump" OR ("Ukraine" AND NOT "Musk"))'
+    assert repr(parse_query("(Trump OR Ukraine) AND Musk")) == '(("Trump" OR "Ukraine") AND "Musk")'
+
+
+def test_adjacent_words_form_one_phrase_and_operands_join_with_and():
+    assert repr(parse_query('peace talks NOT "White House"')) == '("peace talks" AND NOT "White House")'
+    assert repr(parse_query("Trump AND Ukraine, Musk")) == '(("Trump" AND "Ukraine") OR "Musk")'
+
+
+@pytest.mark.parametrize("query", ["Trump AND", "(Trump OR Musk", "Trump )", "NOT"])
+def test_malformed_queries_raise(query):
+    with pytest.raises(QuerySyntaxError):
+        parse_query(query)
+
+
+def test_only_operators_switch_to_boolean_mode():
+    assert is_boolean_query("Trump AND Ukraine")
+    assert is_boolean_query("NOT Musk")
+    assert not is_boolean_query('He said "no deal"')
+    assert not is_boolean_query("talks resumed (again)")
+    assert not is_boolean_query('said "NOT guilty"')
+    assert not is_boolean_query("Trump and Ukraine")
+    assert parse_claim('He said "no deal"') == ['He said "no deal"']
+
+
+def test_negation_only_query_marks_matched_articles():
+    articles = [
+        {"url": "https://a.com/1", "title": "a", "text": "Musk spoke on Monday. Nothing else happened."},
+        {"url": "https://b.com/1", "title": "b", "text": "Talks resumed on Monday. Markets rallied."},
+    ]
+    results = compare_claim_across_articles("NOT Musk", articles, verbose=False)
+    assert results[0]["matches"] == []
+    assert [m["sentence"] for m in results[1]["matches"]] == [QUERY_MATCH_SENTENCE]
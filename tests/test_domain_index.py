@@ -0,0 +1,38 @@
+# tests/test_domain_index.py
+
+from modules.module2c_domain_index import DomainIndex, PublicSuffixList
+
+
+def test_registrable_domain_uses_multi_label_suffixes():
+    psl = PublicSuffixList()
+    assert psl.registrable_domain("edition.cnn.com") == "cnn.com"
+    assert psl.registrable_domain("www.bbc.co.uk") == "bbc.co.uk"
+    assert psl.registrable_domain("news.smh.com.au") == "smh.com.au"
+    assert psl.registrable_domain("co.uk") is None
+
+
+def test_wildcard_and_exception_rules():
+    psl = PublicSuffixList(["*.ck", "!www.ck"])
+    assert psl.registrable_domain("news.site.co.ck") == "site.co.ck"
+    assert psl.registrable_domain("www.ck") == "www.ck"
+
+
+def test_subdomains_match_label_by_label():
+    index = DomainIndex.from_domains(["cnn.com", "bbc.co.uk"])
+    assert index.match("https://edition.cnn.com/2024/story").domain == "cnn.com"
+    assert index.match("https://www.bbc.co.uk/news").domain == "bbc.co.uk"
+    assert index.match("https://notcnn.com/story") is None
+    assert index.match("https://cnn.com.evil.net/story") is None
+
+
+def test_public_suffix_entries_are_ignored():
+    index = DomainIndex.from_domains(["co.uk", "cnn.com"])
+    assert len(index) == 1
+    assert index.match("https://anything.co.uk/x") is None
+
+
+def test_most_specific_entry_wins():
+    index = DomainIndex.from_domains(["cnn.com"])
+    index.add("sponsored.cnn.com", blocked=True)
+    assert index.is_allowed("https://edition.cnn.com/x")
+    assert not index.is_allowed("https://sponsored.cnn.com/x")
@@ -0,0 +1,40 @@
+# tests/test_fact_consensus.py
+
+from modules.module1e_text_analysis import analyze_text
+from modules.module10b_fact_consensus import NumericFactIndex, numeric_facts
+
+
+def article(url, text):
+    return {"url": url, "title": url, "text": text, "analysis": analyze_text(text)}
+
+
+def facts(text):
+    return [(fact.value, fact.word) for fact in numeric_facts(text, analyze_text(text), 0)]
+
+
+def test_grouped_and_decimal_numbers_are_read_whole():
+    assert facts("At least 1,200 killed in the quake.") == [(1200, "killed")]
+    assert facts("Some 2.5 million people fled.") == [(2500000, "people")]
+    assert facts("Turnout was 61.5 percent.") == [(61.5, "percent")]
+
+
+def test_close_grouped_counts_agree():
+    index = NumericFactIndex([
+        article("https://a.com/x", "At least 1,200 killed in the quake."),
+        article("https://b.com/x", "Officials said 1,250 killed in the quake."),
+    ])
+    entries = index.consensus(tolerance=0.1)
+    assert [(e["low"], e["high"], e["outliers"]) for e in entries if e["word"] == "killed"] == [(1200, 1250, [])]
+
+
+def test_outlets_count_once():
+    index = NumericFactIndex([
+        article("https://www.a.com/1", "Police said 40 injured."),
+        article("https://a.com/2", "Police said 41 injured."),
+        article("https://b.com/x", "Police said 90 injured. Later 95 injured were counted."),
+        article("https://c.com/x", "Police said 40 injured."),
+    ])
+    entry, = [e for e in index.consensus() if e["word"] == "injured"]
+    assert entry["outlets"] == ["a.com", "c.com"]
+    assert entry["reporting"] == 3
+    assert [o["outlet"] for o in entry["outliers"]] == ["b.com"]
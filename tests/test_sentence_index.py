@@ -0,0 +1,45 @@
+# tests/test_sentence_index.py
+
+import random
+
+import pytest
+from rapidfuzz import fuzz
+
+from modules.module4b_sentence_index import SentenceIndex
+
+WORDS = ["ceasefire", "talks", "collapsed", "billion", "aid", "minister", "said", "on", "the",
+         "border", "troops", "vote", "delayed", "again", "a", "of"]
+
+
+def corpus(seed=3):
+    rng = random.Random(seed)
+    articles = []
+    for i in range(40):
+        sentences = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 12))) for _ in range(8)]
+        articles.append({"url": f"https://example.com/{i}", "title": str(i), "text": ". ".join(sentences)})
+    return articles
+
+
+@pytest.mark.parametrize("threshold", [70, 85, 95, 100])
+@pytest.mark.parametrize("phrase", ["ceasefire talks collapsed", "billion in aid", "vote delayed", "troops"])
+def test_candidates_are_a_superset_of_matches(phrase, threshold):
+    index = SentenceIndex(corpus())
+    candidates = index.candidate_ids(phrase, threshold)
+    if candidates is None:
+        return
+    candidates = set(candidates.tolist())
+    for sentence_id, sentence in enumerate(index.sentences_lower):
+        if fuzz.partial_ratio(phrase, sentence) >= threshold:
+            assert sentence_id in candidates, sentence
+
+
+def test_exact_candidates_contain_every_substring_hit():
+    index = SentenceIndex(corpus())
+    candidates = set(index.candidate_ids("talks collapsed", 100, exact_match=True).tolist())
+    hits = {i for i, sentence in enumerate(index.sentences_lower) if "talks collapsed" in sentence}
+    assert hits and hits <= candidates
+
+
+def test_index_without_qgrams_never_prunes():
+    index = SentenceIndex(corpus(), qgrams=())
+    assert index.candidate_ids("ceasefire talks collapsed", 95) is None